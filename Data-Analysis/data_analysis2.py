@@ -3,11 +3,18 @@
 # ==============================================================================
 
 # --- Import necessary libraries ---
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.datasets import load_iris # To get a sample dataset
 
+from group_stats import GroupStats # One-pass per-group statistics
+
 # --- Main function to orchestrate the analysis ---
 def main():
     """
@@ -38,7 +45,7 @@ def main():
         iris_df.info()
 
         # Clean the dataset 
-        iris_df.fillna(value, inplace=True) # To fill missing values
+        iris_df.fillna(iris_df.mean(numeric_only=True), inplace=True) # To fill missing values
         iris_df.dropna(inplace=True)        # To drop rows with missing values
         print("\nDataset is clean. No missing values to handle.")
 
@@ -50,14 +57,18 @@ def main():
     # Task 2: Basic Data Analysis
     print("\n--- Task 2: Performing Basic Data Analysis ---")
 
-    # Compute basic statistics of numerical columns
-    print("\nBasic statistical summary:")
-    # .describe() provides mean, median (50%), std, min, max, etc.
-    print(iris_df.describe())
+    # Compute count, mean, std, min, max and quartiles per species in one vectorized pass.
+    # The plots below are drawn from these precomputed results instead of rescanning the rows.
+    stats = GroupStats(iris_df, 'species')
 
-    # Perform groupings on a categorical column ('species') and compute the mean
+    # Basic statistics of numerical columns, per species
+    print("\nBasic statistical summary per species:")
+    # .summary() provides count, mean, std, min, quartiles (50% is the median) and max
+    print(stats.summary())
+
+    # Average of each measurement per species
     print("\nAverage measurements per species:")
-    species_mean = iris_df.groupby('species').mean()
+    species_mean = stats.mean
     print(species_mean)
     
     # Identify patterns or interesting findings
@@ -95,8 +106,10 @@ def main():
     
     # --- 3. Histogram ---
     # Understand the distribution of a single numerical column.
+    # The counts come from the histograms GroupStats built, so no pass over the rows is needed.
     plt.figure(figsize=(10, 6))
-    sns.histplot(iris_df['petal length (cm)'], kde=True, bins=20)
+    counts, edges = stats.histogram('petal length (cm)', bins=20)
+    plt.stairs(counts, edges, fill=True)
     plt.title('Distribution of Petal Length')
     plt.xlabel('Petal Length (cm)')
     plt.ylabel('Frequency')
@@ -106,7 +119,8 @@ def main():
     # Visualize the relationship between two numerical columns.
     # We use 'hue' to color the points by species, which is highly insightful.
     plt.figure(figsize=(10, 6))
-    sns.scatterplot(data=iris_df, x='sepal length (cm)', y='petal length (cm)', hue='species', s=80)
+    # GroupStats keeps a random sample of rows, so large datasets stay readable.
+    sns.scatterplot(data=stats.sample, x='sepal length (cm)', y='petal length (cm)', hue='species', s=80)
     plt.title('Sepal Length vs. Petal Length by Species')
     plt.xlabel('Sepal Length (cm)')
     plt.ylabel('Petal Length (cm)')
@@ -117,6 +131,163 @@ def main():
     print("🎉 Data Analysis Workflow Complete!")
 
 
+# ==============================================================================
+# Headless batch report: no windows, charts written to files in parallel
+# ==============================================================================
+
+# Above this many rows the scatter plot becomes a hexbin-style density plot
+DENSITY_PLOT_ROWS = 50_000
+
+
+def _new_figure(figsize):
+    """Create a figure that is not tied to any display (safe in scheduled jobs)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def _render_line_chart(path, payload):
+    fig, ax = _new_figure((10, 6))
+    ax.plot(payload['x'], payload['y'], marker='o', linestyle='--')
+    ax.set_title(f"{payload['column']} Trend for First {len(payload['x'])} Samples")
+    ax.set_xlabel('Sample Index')
+    ax.set_ylabel(payload['column'])
+    ax.grid(True)
+    fig.savefig(path)
+
+
+def _render_bar_chart(path, payload):
+    fig, ax = _new_figure((12, 7))
+    if payload['means'].empty:
+        # pandas cannot draw a bar chart without rows, so an empty dataset gets a placeholder
+        ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
+    else:
+        payload['means'].plot(kind='bar', ax=ax)
+        ax.legend(title='Measurement Type')
+    ax.set_title('Average Measurements by Group')
+    ax.set_xlabel(payload['means'].index.name)
+    ax.set_ylabel('Average Measurement')
+    ax.tick_params(axis='x', labelrotation=0)
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def _render_histogram(path, payload):
+    fig, ax = _new_figure((10, 6))
+    ax.stairs(payload['counts'], payload['edges'], fill=True)
+    ax.set_title(f"Distribution of {payload['column']}")
+    ax.set_xlabel(payload['column'])
+    ax.set_ylabel('Frequency')
+    fig.savefig(path)
+
+
+def _render_scatter(path, payload):
+    fig, ax = _new_figure((10, 6))
+    if 'density' in payload:
+        # Too many rows for individual points: draw the precomputed 2D counts instead
+        mesh = ax.pcolormesh(payload['x_edges'], payload['y_edges'], payload['density'].T, cmap='viridis')
+        fig.colorbar(mesh, ax=ax, label='Rows')
+        ax.set_title(f"{payload['x']} vs. {payload['y']} (density of {payload['rows']:,} rows)")
+    else:
+        sns.scatterplot(data=payload['points'], x=payload['x'], y=payload['y'], hue=payload['hue'], s=80, ax=ax)
+        ax.set_title(f"{payload['x']} vs. {payload['y']} by {payload['hue']}")
+    ax.set_xlabel(payload['x'])
+    ax.set_ylabel(payload['y'])
+    fig.savefig(path)
+
+
+def run_headless_report(df, group_column, output_dir='report', workers=4,
+                        line_column=None, hist_column=None, scatter_x=None, scatter_y=None,
+                        density_rows=DENSITY_PLOT_ROWS):
+    """
+    Run the whole analysis without any interactive output:
+    statistics are written to CSV, the four charts are rendered to PNG files
+    on a process pool, and the time spent in every stage is printed and returned.
+    """
+    timings = {}
+    os.makedirs(output_dir, exist_ok=True)
+    numeric = [col for col in df.select_dtypes('number').columns if col != group_column]
+    line_column = line_column or numeric[0]
+    hist_column = hist_column or numeric[min(2, len(numeric) - 1)]
+    scatter_x = scatter_x or numeric[0]
+    scatter_y = scatter_y or numeric[min(2, len(numeric) - 1)]
+
+    # --- Stage 1: statistics ---
+    start = time.perf_counter()
+    stats = GroupStats(df, group_column, numeric)
+    stats.summary().to_csv(os.path.join(output_dir, 'summary.csv'))
+    timings['stats'] = time.perf_counter() - start
+
+    # --- Stage 2: chart data (small payloads, so the workers never receive the full dataset) ---
+    start = time.perf_counter()
+    counts, edges = stats.histogram(hist_column, bins=20)
+    if len(df) > density_rows:
+        x_values = df[scatter_x].to_numpy(dtype=np.float32)
+        y_values = df[scatter_y].to_numpy(dtype=np.float32)
+        # histogram2d cannot find its range with NaNs present, and a missing point cannot be drawn anyway
+        drawable = np.isfinite(x_values) & np.isfinite(y_values)
+        density, x_edges, y_edges = np.histogram2d(x_values[drawable], y_values[drawable], bins=200)
+        scatter = {'x': scatter_x, 'y': scatter_y, 'rows': len(df),
+                   'density': np.ma.masked_equal(density, 0), 'x_edges': x_edges, 'y_edges': y_edges}
+    else:
+        scatter = {'x': scatter_x, 'y': scatter_y, 'hue': group_column,
+                   'points': df[[scatter_x, scatter_y, group_column]]}
+    jobs = {
+        'line_chart.png': (_render_line_chart, {'column': line_column,
+                                                'x': df.index[:50].to_numpy(), 'y': df[line_column].iloc[:50].to_numpy()}),
+        'bar_chart.png': (_render_bar_chart, {'means': stats.mean}),
+        'histogram.png': (_render_histogram, {'column': hist_column, 'counts': counts, 'edges': edges}),
+        'scatter.png': (_render_scatter, scatter),
+    }
+    timings['prepare'] = time.perf_counter() - start
+
+    # --- Stage 3: render every chart in its own process ---
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(render, os.path.join(output_dir, name), payload)
+            for name, (render, payload) in jobs.items()
+        ]
+        for future in futures:
+            future.result()
+    timings['render'] = time.perf_counter() - start
+
+    for stage, seconds in timings.items():
+        print(f"[timing] {stage}: {seconds:.3f}s")
+    print(f"Report written to {output_dir}/ ({', '.join(['summary.csv', *jobs])})")
+    return timings
+
+
+def load_iris_frame():
+    """Load the Iris dataset as a DataFrame with a categorical 'species' column."""
+    iris_bunch = load_iris()
+    iris_df = pd.DataFrame(data=iris_bunch.data, columns=iris_bunch.feature_names)
+    iris_df['species'] = pd.Categorical.from_codes(iris_bunch.target, iris_bunch.target_names)
+    return iris_df
+
+
 # --- Run the main function when the script is executed ---
+#   python data_analysis2.py                                        -> interactive walkthrough
+#   python data_analysis2.py --headless --output-dir report         -> Iris report, no windows
+#   python data_analysis2.py --headless --csv big.csv --group label -> same report for any table
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Data analysis workflow")
+    parser.add_argument('--headless', action='store_true', help="Write the report to files without showing anything")
+    parser.add_argument('--output-dir', default='report')
+    parser.add_argument('--csv', help="Analyze this CSV instead of the Iris dataset")
+    parser.add_argument('--group', default='species', help="Column to group by")
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    if args.headless:
+        load_start = time.perf_counter()
+        data = pd.read_csv(args.csv) if args.csv else load_iris_frame()
+        print(f"[timing] load: {time.perf_counter() - load_start:.3f}s")
+        run_headless_report(data, args.group, args.output_dir, args.workers)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,153 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# Above this many rows quantiles come from a histogram sketch instead of sorting
+EXACT_QUANTILE_ROWS = 1_000_000
+SKETCH_BINS = 4096
+SCATTER_SAMPLE_ROWS = 5_000
+
+
+def _reduceat(ufunc, values, starts, **kwargs):
+    """ufunc.reduceat over row blocks that also works when there are no rows at all."""
+    if len(starts) == 0:
+        return np.empty((0, values.shape[1]), dtype=kwargs.get('dtype', values.dtype))
+    return ufunc.reduceat(values, starts, axis=0, **kwargs)
+
+
+class GroupStats:
+    """
+    Per-group count/mean/std/min/max/quantiles of numeric columns, computed in
+    one vectorized NumPy pass over float32 data.
+
+    The rows are sorted by group once, and every statistic is then a single
+    reduceat over all groups and columns at the same time. For large inputs
+    the quantiles come from a fixed-bin histogram sketch (accurate to one bin
+    width), and the same histograms feed the histogram plots. A random row
+    sample is kept for scatter plots. Missing values are skipped, as in
+    DataFrame.groupby().describe().
+    """
+
+    def __init__(self, df, group_column, value_columns=None, quantiles=(0.25, 0.5, 0.75),
+                 exact_quantile_rows=EXACT_QUANTILE_ROWS, bins=SKETCH_BINS, sample_rows=SCATTER_SAMPLE_ROWS):
+        if value_columns is None:
+            value_columns = [col for col in df.select_dtypes('number').columns if col != group_column]
+        self.columns = list(value_columns)
+        self.quantiles = tuple(quantiles)
+
+        codes, groups = pd.factorize(df[group_column], sort=True)
+        self.groups = pd.Index(groups, name=group_column)
+        values = df[self.columns].to_numpy(dtype=np.float32)
+        # Rows without a group (code -1) are left out, like pandas groupby does
+        keep = codes >= 0
+        codes, values = codes[keep], values[keep]
+
+        # --- Sort once by group so each group is one contiguous block ---
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        values = values[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        counts = np.diff(np.r_[starts, len(codes)])
+        group_ids = np.repeat(np.arange(len(starts)), counts)
+
+        # --- Moments and extremes, all groups and columns at once ---
+        # Missing values are skipped like in pandas: every column of every group has
+        # its own count of valid values, and NaNs are replaced by a neutral element
+        valid = ~np.isnan(values)
+        valid_counts = _reduceat(np.add, valid.astype(np.int64), starts)
+        # Sums are accumulated in float64 so millions of float32 values do not lose precision
+        sums = _reduceat(np.add, np.where(valid, values, 0), starts, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / valid_counts
+            centered = np.where(valid, values - means.astype(np.float32)[group_ids], 0)
+            squares = _reduceat(np.add, centered * centered, starts, dtype=np.float64)
+            stds = np.sqrt(squares / (valid_counts - 1))
+        minimums = _reduceat(np.minimum, np.where(valid, values, np.inf), starts)
+        maximums = _reduceat(np.maximum, np.where(valid, values, -np.inf), starts)
+        # A group whose column is entirely missing has no minimum or maximum,
+        # and a standard deviation needs at least two values
+        stds[valid_counts < 2] = np.nan
+        minimums[valid_counts == 0] = np.nan
+        maximums[valid_counts == 0] = np.nan
+
+        self.count = pd.Series(counts, index=self.groups, name='count')
+        self.valid_count = pd.DataFrame(valid_counts, index=self.groups, columns=self.columns)
+        self.mean = pd.DataFrame(means, index=self.groups, columns=self.columns)
+        self.std = pd.DataFrame(stds, index=self.groups, columns=self.columns)
+        self.min = pd.DataFrame(minimums, index=self.groups, columns=self.columns)
+        self.max = pd.DataFrame(maximums, index=self.groups, columns=self.columns)
+
+        # --- Histograms (always) and quantiles (exact or from the sketch) ---
+        self.bin_edges = {}
+        self.histograms = {}
+        for i, column in enumerate(self.columns):
+            column_values = values[:, i]
+            # The bin range comes from the finite values only; NaNs are not binned at all
+            # and infinities fall into the first or last bin
+            finite = column_values[np.isfinite(column_values)]
+            low, high = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+            edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+            binned = valid[:, i]
+            bin_ids = np.clip(np.searchsorted(edges, column_values[binned], side='right') - 1, 0, bins - 1)
+            # One bincount builds the histogram of every group for this column
+            histogram = np.bincount(group_ids[binned] * bins + bin_ids, minlength=len(starts) * bins)
+            self.bin_edges[column] = edges
+            self.histograms[column] = histogram.reshape(len(starts), bins)
+
+        self.exact_quantiles = len(values) <= exact_quantile_rows
+        quantile_table = {}
+        for q in self.quantiles:
+            if self.exact_quantiles:
+                with warnings.catch_warnings():
+                    # An all-NaN column of a group simply has a NaN quantile
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    rows = [np.nanquantile(values[start:start + count], q, axis=0) for start, count in zip(starts, counts)]
+            else:
+                rows = [self._sketch_quantile(g, q) for g in range(len(starts))]
+            quantile_table[q] = pd.DataFrame(rows, index=self.groups, columns=self.columns, dtype=np.float64)
+        self.quantile = quantile_table
+
+        # --- Random sample of rows for scatter plots ---
+        rng = np.random.default_rng(0)
+        sample_size = min(sample_rows, len(values))
+        picked = np.sort(rng.choice(len(values), size=sample_size, replace=False))
+        self.sample = pd.DataFrame(values[picked], columns=self.columns)
+        self.sample[group_column] = pd.Categorical.from_codes(codes[picked], categories=self.groups)
+
+    def _sketch_quantile(self, group, q):
+        """Approximate quantile q of every column for one group from its histogram."""
+        result = []
+        for column in self.columns:
+            histogram = self.histograms[column][group]
+            edges = self.bin_edges[column]
+            cumulative = np.cumsum(histogram)
+            if cumulative[-1] == 0:
+                # Every value of this column is missing in this group
+                result.append(np.nan)
+                continue
+            target = q * cumulative[-1]
+            b = int(np.searchsorted(cumulative, target))
+            before = cumulative[b - 1] if b else 0
+            # Interpolate linearly inside the bin that holds the target rank
+            fraction = (target - before) / histogram[b] if histogram[b] else 0.0
+            result.append(edges[b] + fraction * (edges[b + 1] - edges[b]))
+        return result
+
+    def summary(self):
+        """Return a describe()-like table with one row per (group, statistic)."""
+        parts = {'count': self.valid_count,
+                 'mean': self.mean, 'std': self.std, 'min': self.min}
+        for q, table in self.quantile.items():
+            parts[f"{q:.0%}"] = table
+        parts['max'] = self.max
+        return pd.concat(parts, names=['statistic']).swaplevel().sort_index(level=0, sort_remaining=False)
+
+    def histogram(self, column, bins=20):
+        """Return (counts, edges) of a column over all groups, merged down to `bins` bins."""
+        counts = self.histograms[column].sum(axis=0)
+        edges = self.bin_edges[column]
+        # Split the fine bins as evenly as possible, so every merged bin has (almost) the same width
+        bounds = np.linspace(0, len(counts), min(bins, len(counts)) + 1).round().astype(int)
+        return np.add.reduceat(counts, bounds[:-1]), edges[bounds]
@@ -0,0 +1,76 @@
+# aggregates.py
+
+import numpy as np
+import pandas as pd
+
+
+class YearJournalIndex:
+    """
+    A precomputed (year x journal) count cube for the cleaned CORD-19 frame.
+
+    It is built once at load time. After that, "publications per year" and
+    "top journals" for any year range are answered from the cube alone,
+    at a cost of O(years x journals) that does not depend on the number of papers.
+    """
+
+    # Must be at least the largest sample size requested from sample()
+    SAMPLE_ROWS_PER_YEAR = 10
+
+    def __init__(self, df):
+        """Builds the cube from a cleaned frame with 'year' and 'journal' columns."""
+        counts = df.groupby(['year', 'journal'], observed=True).size().unstack(fill_value=0)
+
+        self.years = counts.index.to_numpy(dtype='int64')
+        self.journals = counts.columns.astype(str).to_numpy()
+        # Cumulative sums along the year axis turn a range sum into one subtraction:
+        # counts for years[i..j] = cumulative[j + 1] - cumulative[i]
+        cube = counts.to_numpy(dtype='int64')
+        self.cumulative = np.vstack([np.zeros((1, cube.shape[1]), dtype='int64'), cube.cumsum(axis=0)])
+        self.year_totals = cube.sum(axis=1)
+
+        # Keep a few row positions per year so the "raw data sample" never needs a full mask either
+        positions = pd.Series(np.arange(len(df)), index=df['year'].to_numpy())
+        self.sample_positions = {
+            int(year): group.to_numpy()[:self.SAMPLE_ROWS_PER_YEAR]
+            for year, group in positions.groupby(level=0)
+        }
+
+    def _year_slice(self, start_year, end_year):
+        """Returns the [start, stop) positions of the years inside the given range."""
+        start = int(np.searchsorted(self.years, start_year, side='left'))
+        stop = int(np.searchsorted(self.years, end_year, side='right'))
+        return start, stop
+
+    def year_counts(self, start_year, end_year):
+        """Returns the number of papers per year within the range, sorted by year."""
+        start, stop = self._year_slice(start_year, end_year)
+        return pd.Series(self.year_totals[start:stop], index=self.years[start:stop], name='count')
+
+    def journal_counts(self, start_year, end_year):
+        """Returns the number of papers per journal within the range (unsorted, zeros dropped)."""
+        start, stop = self._year_slice(start_year, end_year)
+        totals = self.cumulative[stop] - self.cumulative[start]
+        counts = pd.Series(totals, index=self.journals, name='count')
+        return counts[counts > 0]
+
+    def top_journals(self, start_year, end_year, n=10):
+        """Returns the n journals with the most papers within the range."""
+        return self.journal_counts(start_year, end_year).nlargest(n)
+
+    def total(self, start_year, end_year):
+        """Returns the number of papers within the range."""
+        start, stop = self._year_slice(start_year, end_year)
+        return int(self.year_totals[start:stop].sum())
+
+    def sample(self, df, start_year, end_year, n=10):
+        """
+        Returns the first n rows of df within the range (same as filtering then .head(n))
+        without scanning the whole frame: the first n rows of the range are always
+        among the first n rows of their own year.
+        """
+        start, stop = self._year_slice(start_year, end_year)
+        candidates = [self.sample_positions[int(year)] for year in self.years[start:stop]]
+        if not candidates:
+            return df.iloc[[]]
+        picked = np.sort(np.concatenate(candidates))[:n]
+        return df.iloc[picked]
@@ -0,0 +1,111 @@
+# charts.py
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class ChartRenderer:
+    """
+    Renders the explorer's charts to PNG bytes and caches them by (chart type, year range).
+
+    Figures are created with the object-oriented Figure API instead of pyplot,
+    so they are never registered in pyplot's global figure list. Each one is
+    rendered on its own canvas and cleared as soon as its PNG has been written,
+    which keeps memory flat however many users are connected.
+    """
+
+    def __init__(self, year_journal_index, max_entries=256, max_workers=2):
+        self.index = year_journal_index
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chart-render')
+
+    # --- Chart Drawing ---
+    def _draw_publications(self, ax, start_year, end_year):
+        """Draws the 'Publications Over Time' line chart."""
+        year_counts = self.index.year_counts(start_year, end_year)
+        sns.lineplot(x=year_counts.index, y=year_counts.values, ax=ax, marker='o')
+        ax.set_title('Number of Publications by Year')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Number of Papers')
+
+    def _draw_top_journals(self, ax, start_year, end_year):
+        """Draws the 'Top 10 Journals' horizontal bar chart."""
+        top_journals = self.index.top_journals(start_year, end_year, n=10)
+        sns.barplot(x=top_journals.values, y=top_journals.index, ax=ax, palette='mako')
+        ax.set_title('Top 10 Journals by Number of Publications')
+        ax.set_xlabel('Number of Papers')
+        ax.set_ylabel('Journal')
+
+    CHARTS = {
+        'publications': _draw_publications,
+        'top_journals': _draw_top_journals,
+    }
+
+    def _render_png(self, chart_type, start_year, end_year):
+        """Renders one chart to PNG bytes and releases the figure afterwards."""
+        fig = Figure(figsize=(10, 6))
+        try:
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            self.CHARTS[chart_type](self, ax, start_year, end_year)
+            fig.tight_layout()
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png')
+            return buffer.getvalue()
+        finally:
+            fig.clear()
+
+    # --- Cache Access ---
+    def _lookup(self, key):
+        """Returns the cached PNG for key (or None) and updates the hit/miss counters."""
+        with self._lock:
+            png = self._cache.get(key)
+            if png is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+            return png
+
+    def _store(self, key, png):
+        """Adds a rendered PNG to the cache, evicting the least recently used entries."""
+        with self._lock:
+            self._cache[key] = png
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def render(self, chart_type, start_year, end_year):
+        """Returns the PNG bytes of one chart, rendering it only on a cache miss."""
+        key = (chart_type, start_year, end_year)
+        png = self._lookup(key)
+        if png is None:
+            png = self._render_png(chart_type, start_year, end_year)
+            self._store(key, png)
+        return png
+
+    def render_all(self, start_year, end_year, chart_types=('publications', 'top_journals')):
+        """
+        Renders several charts for the same year range concurrently.
+        Returns a dict of chart type -> PNG bytes.
+        """
+        futures = {
+            chart_type: self._executor.submit(self.render, chart_type, start_year, end_year)
+            for chart_type in chart_types
+        }
+        return {chart_type: future.result() for chart_type, future in futures.items()}
+
+    def cache_info(self):
+        """Returns the cache hit/miss counters and current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
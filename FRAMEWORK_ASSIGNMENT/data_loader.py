@@ -0,0 +1,288 @@
+# data_loader.py
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    # 'resource' is only available on Unix-like systems.
+    import resource
+except ImportError:
+    resource = None
+
+
+# --- Column Selection and Compact Dtypes ---
+# Only these columns are ever used by the explorer, so we never parse the rest.
+ESSENTIAL_COLUMNS = ['title', 'abstract', 'journal', 'publish_time', 'source_x']
+
+# Journals and sources repeat millions of times, so storing them as categories
+# keeps one copy of each string instead of one per row.
+CATEGORICAL_COLUMNS = ['journal', 'source_x']
+COLUMN_DTYPES = {
+    'title': 'string',
+    'abstract': 'string',
+    'journal': 'category',
+    'publish_time': 'string',
+    'source_x': 'category',
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+MIN_YEAR = 2000
+
+# --- On-Disk Cache Settings ---
+# Bump this whenever the cleaning logic changes so old cache files are ignored.
+CACHE_VERSION = 2
+CACHE_DIR_NAME = '.cord19_cache'
+# Hashing a multi-GB file on every start would defeat the purpose of the cache,
+# so we hash its first and last block together with its size and mtime.
+FINGERPRINT_BLOCK = 1024 * 1024
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident memory of this process in MB,
+    or None if the platform does not expose it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux.
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def clean_chunk(chunk, min_year=MIN_YEAR):
+    """
+    Applies the cleaning steps to a single chunk of metadata rows:
+    drop missing values, parse dates, extract the year and filter by year.
+    """
+    chunk = chunk.dropna(subset=ESSENTIAL_COLUMNS)
+
+    # Convert publish_time to datetime; unparseable dates become NaT and are dropped.
+    # The format is explicit because pandas otherwise guesses it from each chunk's
+    # first date, and the rows kept would then depend on the chunk size.
+    # ISO8601 accepts both full dates ('2020-03-01') and bare years ('2020').
+    publish_time = pd.to_datetime(chunk['publish_time'], errors='coerce', format='ISO8601')
+    chunk = chunk.assign(publish_time=publish_time)
+    chunk = chunk[chunk['publish_time'].notna()]
+
+    year = chunk['publish_time'].dt.year
+    chunk = chunk[year > min_year].copy()
+    chunk['year'] = chunk['publish_time'].dt.year.astype('int16')
+    return chunk
+
+
+def concat_chunks(chunks):
+    """
+    Concatenates cleaned chunks while keeping categorical columns categorical.
+    (pd.concat falls back to object dtype when the categories differ per chunk.)
+    """
+    if not chunks:
+        empty = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in COLUMN_DTYPES.items()})
+        empty['publish_time'] = pd.Series(dtype='datetime64[ns]')
+        empty['year'] = pd.Series(dtype='int16')
+        return empty
+
+    categoricals = {
+        col: union_categoricals([chunk[col] for chunk in chunks], ignore_order=True)
+        for col in CATEGORICAL_COLUMNS
+    }
+    df = pd.concat([chunk.drop(columns=CATEGORICAL_COLUMNS) for chunk in chunks], ignore_index=True)
+    for col, values in categoricals.items():
+        df[col] = pd.Categorical(values)
+    # Restore the original column order (including any extra feature columns)
+    return df[list(chunks[0].columns)]
+
+
+def load_metadata_chunked_iter(file_path, chunksize=DEFAULT_CHUNKSIZE, min_year=MIN_YEAR):
+    """
+    Yields (rows read, cleaned chunk) pairs for the CORD-19 metadata one chunk
+    at a time, reading only the essential columns with compact dtypes.
+    Consumers that only aggregate (e.g. word counts) never need the whole frame in memory.
+    """
+    reader = pd.read_csv(
+        file_path,
+        usecols=ESSENTIAL_COLUMNS,
+        dtype=COLUMN_DTYPES,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            yield len(chunk), clean_chunk(chunk, min_year=min_year)
+
+
+def load_metadata_chunked(file_path, chunksize=DEFAULT_CHUNKSIZE, min_year=MIN_YEAR, memory_budget_mb=None):
+    """
+    Streams the CORD-19 metadata in bounded chunks, reading only the essential
+    columns with compact dtypes, and cleans each chunk as it arrives.
+
+    Returns a tuple of (cleaned DataFrame, stats dict). The stats dict contains
+    the rows read/kept, elapsed seconds, rows per second and peak RSS in MB.
+    """
+    start = time.perf_counter()
+    rows_read = 0
+    chunks = []
+
+    for chunk_rows, chunk in load_metadata_chunked_iter(file_path, chunksize=chunksize, min_year=min_year):
+        rows_read += chunk_rows
+        chunks.append(chunk)
+
+    df = concat_chunks(chunks)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'rows_read': rows_read,
+        'rows_kept': len(df),
+        'seconds': elapsed,
+        'rows_per_sec': rows_read / elapsed if elapsed > 0 else float('inf'),
+        'peak_rss_mb': peak_rss_mb(),
+        'frame_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+        'memory_budget_mb': memory_budget_mb,
+    }
+    stats['within_budget'] = (
+        None if memory_budget_mb is None or stats['peak_rss_mb'] is None
+        else stats['peak_rss_mb'] <= memory_budget_mb
+    )
+    return df, stats
+
+
+def format_stats(stats):
+    """Returns a one-line human readable summary of the loader stats."""
+    peak = stats['peak_rss_mb']
+    peak_text = f"{peak:,.1f} MB" if peak is not None else "n/a"
+    line = (
+        f"[{stats.get('source', 'csv')}] {stats['rows_kept']:,} of {stats['rows_read']:,} rows kept in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_sec']:,.0f} rows/sec), frame {stats['frame_mb']:,.1f} MB, peak RSS {peak_text}"
+    )
+    if stats['within_budget'] is not None:
+        status = "within" if stats['within_budget'] else "OVER"
+        line += f" - {status} budget of {stats['memory_budget_mb']:,} MB"
+    return line
+
+
+# --- Persistent Columnar Cache ---
+def file_fingerprint(file_path):
+    """
+    Returns a short hex key identifying the current contents of a file,
+    built from its size, modification time and a hash of its first and last block.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BLOCK))
+        if stat.st_size > FINGERPRINT_BLOCK:
+            f.seek(max(stat.st_size - FINGERPRINT_BLOCK, FINGERPRINT_BLOCK))
+            digest.update(f.read(FINGERPRINT_BLOCK))
+    return digest.hexdigest()[:16]
+
+
+def cache_path_for(file_path, cache_dir=None, min_year=MIN_YEAR):
+    """Returns the Parquet cache path for the current version of file_path."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+    # The year filter changes the cleaned rows, so it is part of the key too
+    stem = f"{os.path.splitext(os.path.basename(file_path))[0]}-after{min_year}"
+    return os.path.join(cache_dir, f"{stem}-{file_fingerprint(file_path)}.parquet")
+
+
+def _remove_stale_caches(cache_path):
+    """Deletes cache files left behind by older versions of the same source file."""
+    cache_dir = os.path.dirname(cache_path)
+    stem = os.path.basename(cache_path).rsplit('-', 1)[0]
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith(f"{stem}-") and name.endswith('.parquet') and path != cache_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_cleaned_metadata(file_path, cache_dir=None, use_cache=True, **load_kwargs):
+    """
+    Returns the cleaned metadata, reading it from a Parquet cache when the
+    source file is unchanged and rebuilding the cache from the CSV otherwise.
+
+    The cache survives app restarts and is shared by every worker, so only the
+    first start after metadata.csv changes pays for the CSV parse.
+    Returns a tuple of (cleaned DataFrame, stats dict) like load_metadata_chunked.
+    """
+    if not use_cache:
+        df, stats = load_metadata_chunked(file_path, **load_kwargs)
+        stats['source'] = 'csv'
+        return df, stats
+
+    cache_path = cache_path_for(file_path, cache_dir, load_kwargs.get('min_year', MIN_YEAR))
+    if os.path.exists(cache_path):
+        start = time.perf_counter()
+        try:
+            # memory_map lets pyarrow read the columns straight from the OS page cache
+            df = pd.read_parquet(cache_path, memory_map=True)
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable cache '{cache_path}'. Reason: {e}")
+        else:
+            elapsed = time.perf_counter() - start
+            stats = {
+                'rows_read': len(df),
+                'rows_kept': len(df),
+                'seconds': elapsed,
+                'rows_per_sec': len(df) / elapsed if elapsed > 0 else float('inf'),
+                'peak_rss_mb': peak_rss_mb(),
+                'frame_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+                'memory_budget_mb': load_kwargs.get('memory_budget_mb'),
+                'within_budget': None,
+                'source': 'cache',
+            }
+            return df, stats
+
+    df, stats = load_metadata_chunked(file_path, **load_kwargs)
+    stats['source'] = 'csv'
+
+    # Write to a temporary file first so a crash never leaves a half-written cache behind.
+    # Every writer gets its own temporary name, so workers building the cache at the
+    # same time cannot overwrite each other's partial file before it is renamed.
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+        _remove_stale_caches(cache_path)
+    except (OSError, ImportError) as e:
+        print(f"Warning: could not write cache '{cache_path}'. Reason: {e}")
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df, stats
+
+
+# --- Command Line Entry Point ---
+# Lets us measure a load outside of Streamlit, e.g.
+#   python data_loader.py metadata.csv --chunksize 50000 --memory-budget 2048
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream and clean the CORD-19 metadata.csv")
+    parser.add_argument('file_path', nargs='?', default='metadata.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--memory-budget', type=int, default=None, help="Peak RSS budget in MB")
+    parser.add_argument('--no-cache', action='store_true', help="Always parse the CSV, ignoring the Parquet cache")
+    args = parser.parse_args()
+
+    _, load_stats = load_cleaned_metadata(
+        args.file_path,
+        use_cache=not args.no_cache,
+        chunksize=args.chunksize,
+        memory_budget_mb=args.memory_budget,
+    )
+    print(format_stats(load_stats))
+    if load_stats['within_budget'] is False:
+        sys.exit(1)
@@ -1,9 +1,14 @@
 # app.py
 
+import os
+import time
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from data_loader import CACHE_DIR_NAME, load_cleaned_metadata, format_stats
+from aggregates import YearJournalIndex
+from charts import ChartRenderer
+from search_index import load_or_build_index
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -21,34 +26,50 @@ st.write("This application provides a simple analysis of the CORD-19 dataset, fo
 def load_and_clean_data(file_path):
     """
     Loads and cleans the CORD-19 metadata.
+    The file is streamed in chunks and only the essential columns are read,
+    so memory stays bounded even for multi-GB metadata.csv files.
+    The cleaned frame is also cached on disk as Parquet, so restarts skip the CSV parse.
     """
-    df = pd.read_csv(file_path, low_memory=False)
-    
-    # Select and clean essential columns
-    essential_columns = ['title', 'abstract', 'journal', 'publish_time', 'source_x']
-    df_cleaned = df.dropna(subset=essential_columns)
-    
-    # Convert publish_time to datetime and extract year
-    df_cleaned['publish_time'] = pd.to_datetime(df_cleaned['publish_time'], errors='coerce')
-    df_cleaned.dropna(subset=['publish_time'], inplace=True)
-    df_cleaned['year'] = df_cleaned['publish_time'].dt.year
-    
-    # Filter for a reasonable year range (e.g., post-2000)
-    df_cleaned = df_cleaned[df_cleaned['year'] > 2000].copy()
-    df_cleaned['year'] = df_cleaned['year'].astype(int)
-
-    return df_cleaned
+    return load_cleaned_metadata(file_path)
+
+@st.cache_resource # Built once per process and shared by every session
+def build_year_journal_index(file_path):
+    """
+    Precomputes the (year x journal) counts so the charts below never rescan the rows.
+    """
+    df, _ = load_and_clean_data(file_path)
+    return YearJournalIndex(df)
+
+@st.cache_resource # One renderer (and chart cache) shared by every session
+def get_chart_renderer(file_path):
+    """
+    Creates the chart renderer that caches rendered charts by (chart type, year range).
+    """
+    return ChartRenderer(build_year_journal_index(file_path))
+
+@st.cache_resource # The index is persisted on disk and only new rows are indexed on restart
+def get_search_index(file_path):
+    """
+    Loads (or builds) the full-text search index over titles and abstracts.
+    """
+    df, _ = load_and_clean_data(file_path)
+    index_path = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME, 'search-index.pkl')
+    index, _ = load_or_build_index(df, index_path)
+    return index
 
 # Load the data using the function
-df = load_and_clean_data('metadata.csv')
+df, load_stats = load_and_clean_data('metadata.csv')
+year_journal_index = build_year_journal_index('metadata.csv')
+chart_renderer = get_chart_renderer('metadata.csv')
 
 
 # --- Sidebar for Filters ---
 st.sidebar.header("Filters")
+st.sidebar.caption(f"Loaded: {format_stats(load_stats)}")
 
 # Get min and max year from the data for the slider
-min_year = int(df['year'].min())
-max_year = int(df['year'].max())
+min_year = int(year_journal_index.years.min())
+max_year = int(year_journal_index.years.max())
 
 # Create a year range slider
 selected_year_range = st.sidebar.slider(
@@ -58,43 +79,46 @@ selected_year_range = st.sidebar.slider(
     value=(2020, max_year) # Default range
 )
 
-# Filter the dataframe based on the selected year range
+# The selected year range is answered from the precomputed index, not by filtering df
 start_year, end_year = selected_year_range
-filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
 
 st.header(f"Displaying Data from {start_year} to {end_year}")
 
 
 # --- Main Page Layout ---
+# Both charts are rendered off-thread at the same time and served from the
+# renderer's cache when this year range has been drawn before.
+charts = chart_renderer.render_all(start_year, end_year)
+
 # Create two columns for visualizations
 col1, col2 = st.columns(2)
 
 
 with col1:
     st.subheader("Publications Over Time")
-    # Analysis
-    year_counts = filtered_df['year'].value_counts().sort_index()
-    # Visualization
-    fig1, ax1 = plt.subplots(figsize=(10, 6))
-    sns.lineplot(x=year_counts.index, y=year_counts.values, ax=ax1, marker='o')
-    ax1.set_title('Number of Publications by Year')
-    ax1.set_xlabel('Year')
-    ax1.set_ylabel('Number of Papers')
-    st.pyplot(fig1)
+    st.image(charts['publications'], use_container_width=True)
 
 with col2:
     st.subheader("Top 10 Publishing Journals")
-    # Analysis
-    top_journals = filtered_df['journal'].value_counts().head(10)
-    # Visualization
-    fig2, ax2 = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=top_journals.values, y=top_journals.index, ax=ax2, palette='mako')
-    ax2.set_title('Top 10 Journals by Number of Publications')
-    ax2.set_xlabel('Number of Papers')
-    ax2.set_ylabel('Journal')
-    st.pyplot(fig2)
+    st.image(charts['top_journals'], use_container_width=True)
+
+# --- Full-Text Search ---
+st.subheader("Search Papers")
+query = st.text_input("Search titles and abstracts", placeholder="e.g. viral transmission")
+if query:
+    search_index = get_search_index('metadata.csv')
+    search_start = time.perf_counter()
+    results = search_index.search_frame(df, query, k=20, start_year=start_year, end_year=end_year)
+    search_ms = (time.perf_counter() - search_start) * 1000
+    st.caption(f"{len(results)} results in {search_ms:.1f} ms")
+    st.dataframe(results[['title', 'journal', 'year', 'score']])
 
 # --- Show a sample of the data ---
 st.subheader("Raw Data Sample")
 st.write("A sample of the filtered data.")
-st.dataframe(filtered_df[['title', 'journal', 'year', 'source_x']].head(10))
\ No newline at end of file
+sample_df = year_journal_index.sample(df, start_year, end_year, n=10)
+st.dataframe(sample_df[['title', 'journal', 'year', 'source_x']])
+
+# --- Chart Cache Statistics ---
+cache_info = chart_renderer.cache_info()
+st.sidebar.caption(f"Chart cache: {cache_info['hits']} hits, {cache_info['misses']} misses, {cache_info['size']} cached")
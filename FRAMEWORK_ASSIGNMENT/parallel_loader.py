@@ -0,0 +1,211 @@
+# parallel_loader.py
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data_loader import COLUMN_DTYPES, ESSENTIAL_COLUMNS, MIN_YEAR, clean_chunk, concat_chunks, load_metadata_chunked
+from word_counts import word_count_series
+
+
+# Upper bound on the bytes a single worker parses at once.
+MAX_SHARD_BYTES = 64 * 1024 * 1024
+
+# Bytes read at a time while counting quotes between shard boundaries.
+QUOTE_SCAN_BLOCK = 16 * 1024 * 1024
+
+
+# Abstracts can contain quoted newlines, so a newline alone is not a safe place
+# to split the CSV, and no pattern at the start of a line is either: a quoted
+# abstract can contain a line that looks exactly like a new row.
+# A newline ends a record only when the number of quote characters before it is
+# even (an escaped quote inside a field is written as two quotes, so it never
+# changes the parity). We start counting at the first data row, which is a known
+# record start, and carry the count from one boundary to the next.
+def _count_quotes(f, start, end):
+    """Counts the quote characters in the byte range [start, end) of an open file."""
+    f.seek(start)
+    count = 0
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(QUOTE_SCAN_BLOCK, remaining))
+        if not block:
+            break
+        count += block.count(b'"')
+        remaining -= len(block)
+    return count
+
+
+def _read_to_record_end(f, inside_quotes=False):
+    """
+    Reads lines from the current position of f until one ends outside a quoted
+    field, i.e. at the end of a record. inside_quotes tells whether the current
+    position is inside a quoted field. Returns the number of bytes read.
+    """
+    read = 0
+    while True:
+        line = f.readline()
+        if not line:
+            return read
+        read += len(line)
+        inside_quotes ^= line.count(b'"') % 2 == 1
+        if not inside_quotes and line.endswith(b'\n'):
+            return read
+
+
+def find_shard_boundaries(file_path, shard_count):
+    """
+    Splits a CSV file into shard_count byte ranges that each start at the beginning of a record.
+    Returns (header bytes, list of (start, end) offsets).
+
+    Finding the record starts means counting the quotes in the whole file once,
+    which runs at disk speed and is small next to parsing it.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        # The header is a record too, and may itself contain quoted newlines
+        data_start = _read_to_record_end(f)
+        f.seek(0)
+        header = f.read(data_start)
+
+        boundaries = [data_start]
+        # `position` is always a record start, with every byte before it counted
+        position = data_start
+        for i in range(1, shard_count):
+            target = data_start + (size - data_start) * i // shard_count
+            if target <= position:
+                continue
+            inside_quotes = _count_quotes(f, position, target) % 2 == 1
+            f.seek(target)
+            position = target + _read_to_record_end(f, inside_quotes)
+            if position >= size:
+                break
+            boundaries.append(position)
+        boundaries.append(size)
+
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def process_shard(file_path, header, start, end, min_year=MIN_YEAR):
+    """
+    Worker function: parses the byte range [start, end) of the CSV, cleans it
+    and adds the abstract word count feature.
+    Returns (rows read, cleaned DataFrame).
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    shard = pd.read_csv(
+        io.BytesIO(header + data),
+        usecols=ESSENTIAL_COLUMNS,
+        dtype=COLUMN_DTYPES,
+    )
+    cleaned = clean_chunk(shard, min_year=min_year)
+    cleaned['abstract_word_count'] = word_count_series(cleaned['abstract']).astype('int32')
+    return len(shard), cleaned
+
+
+def load_metadata_parallel(file_path, workers=None, min_year=MIN_YEAR, max_shard_bytes=MAX_SHARD_BYTES):
+    """
+    Cleans and featurizes the CORD-19 metadata on a process pool.
+
+    The file is split into row-aligned byte ranges, every range is parsed,
+    cleaned and given an 'abstract_word_count' column in its own process,
+    and the results are merged in file order.
+    Returns a tuple of (cleaned DataFrame, stats dict).
+    """
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    # At least one shard per worker, and more when shards would otherwise get too big
+    size = os.path.getsize(file_path)
+    shard_count = max(workers, -(-size // max_shard_bytes))
+    header, shards = find_shard_boundaries(file_path, shard_count)
+
+    if workers == 1:
+        results = [process_shard(file_path, header, start, end, min_year) for start, end in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(process_shard, file_path, header, start, end, min_year)
+                for start, end in shards
+            ]
+            results = [future.result() for future in futures]
+
+    rows_read = sum(rows for rows, _ in results)
+    df = concat_chunks([chunk for _, chunk in results])
+    elapsed = time.perf_counter() - start_time
+
+    stats = {
+        'workers': workers,
+        'shards': len(shards),
+        'rows_read': rows_read,
+        'rows_kept': len(df),
+        'seconds': elapsed,
+        'rows_per_sec': rows_read / elapsed if elapsed > 0 else float('inf'),
+    }
+    return df, stats
+
+
+def verify_against_sequential(file_path, workers=None, max_shard_bytes=MAX_SHARD_BYTES):
+    """
+    Checks that the parallel loader returns exactly the frame the single-process
+    chunked loader returns for the same file (apart from the extra word count column).
+    Raises AssertionError with the first difference otherwise.
+    """
+    parallel, _ = load_metadata_parallel(file_path, workers=workers, max_shard_bytes=max_shard_bytes)
+    sequential, _ = load_metadata_chunked(file_path)
+    pd.testing.assert_frame_equal(
+        parallel.drop(columns=['abstract_word_count']),
+        sequential,
+        check_categorical=False,  # categories are merged in a different order
+    )
+    return len(parallel)
+
+
+def benchmark(file_path, worker_counts=None):
+    """
+    Times load_metadata_parallel for several worker counts and prints the
+    speedup of each one relative to a single worker.
+    """
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, cpus} & set(range(1, cpus + 1)))
+
+    print(f"{'workers':>8} {'shards':>7} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+    baseline = None
+    results = []
+    for workers in worker_counts:
+        _, stats = load_metadata_parallel(file_path, workers=workers)
+        if baseline is None:
+            baseline = stats['seconds']
+        speedup = baseline / stats['seconds'] if stats['seconds'] > 0 else float('inf')
+        results.append((workers, stats['seconds'], speedup))
+        print(
+            f"{workers:>8} {stats['shards']:>7} {stats['seconds']:>9.2f} "
+            f"{stats['rows_per_sec']:>12,.0f} {speedup:>7.2f}x"
+        )
+    return results
+
+
+# --- Command Line Entry Point ---
+#   python parallel_loader.py metadata.csv --workers 1 2 4 8 16 32
+#   python parallel_loader.py metadata.csv --verify
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark parallel CORD-19 cleaning against worker count")
+    parser.add_argument('file_path', nargs='?', default='metadata.csv')
+    parser.add_argument('--workers', type=int, nargs='+', default=None)
+    parser.add_argument('--verify', action='store_true', help="Check the result against the sequential loader instead")
+    args = parser.parse_args()
+
+    if args.verify:
+        rows = verify_against_sequential(args.file_path, workers=args.workers[0] if args.workers else None)
+        print(f"OK: the parallel and sequential loaders agree on all {rows:,} rows")
+    else:
+        benchmark(args.file_path, args.workers)
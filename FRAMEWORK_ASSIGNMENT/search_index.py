@@ -0,0 +1,256 @@
+# search_index.py
+
+import math
+import os
+import hashlib
+import pickle
+import tempfile
+import time
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+
+from word_counts import STOP_WORDS, tokenize
+
+
+# BM25 ranking parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Title terms are counted this many times so matches in the title rank higher
+TITLE_WEIGHT = 2
+INDEX_VERSION = 2
+
+
+class SearchIndex:
+    """
+    An inverted index over the titles and abstracts of the cleaned CORD-19 frame.
+
+    Documents are identified by their row position in the cleaned frame, and
+    each term maps to compact arrays of (document id, term frequency).
+    Queries are ranked with BM25 and never scan the frame itself.
+    Because cleaning only drops rows, an appended metadata.csv produces a
+    cleaned frame whose first rows are unchanged, so update() only has to
+    index the new rows at the end. To make sure the first rows really are
+    unchanged, the index keeps a content hash of every block of rows it indexed.
+    """
+
+    def __init__(self, stop_words=STOP_WORDS):
+        self.stop_words = frozenset(stop_words)
+        self.postings = defaultdict(lambda: (array('I'), array('H')))
+        self.doc_lengths = array('I')
+        self.total_length = 0
+        # (end row, content hash) of every block of rows indexed by update()
+        self.block_hashes = []
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    # --- Building ---
+    def add_documents(self, titles, abstracts):
+        """Indexes the given titles/abstracts as the next documents, in order."""
+        doc_id = len(self.doc_lengths)
+        for title, abstract in zip(titles, abstracts):
+            terms = Counter()
+            for term in tokenize(title, self.stop_words):
+                terms[term] += TITLE_WEIGHT
+            terms.update(tokenize(abstract, self.stop_words))
+
+            for term, tf in terms.items():
+                ids, freqs = self.postings[term]
+                ids.append(doc_id)
+                freqs.append(min(tf, 65535))
+            length = sum(terms.values())
+            self.doc_lengths.append(length)
+            self.total_length += length
+            doc_id += 1
+
+    def update(self, df):
+        """
+        Brings the index up to date with df. Only rows after the last indexed one
+        are tokenized. Returns the number of newly indexed rows, or None if
+        the existing rows changed and the index must be rebuilt instead.
+        """
+        indexed = len(self)
+        if len(df) < indexed:
+            return None
+        # Every indexed row must belong to a hashed block whose rows are unchanged in df.
+        # Hashing is much cheaper than tokenizing, so this check costs little.
+        start = 0
+        for end, digest in self.block_hashes:
+            if _rows_digest(df.iloc[start:end]) != digest:
+                return None
+            start = end
+        if start != indexed:
+            return None
+
+        new_rows = df.iloc[indexed:]
+        if len(new_rows):
+            self.add_documents(new_rows['title'], new_rows['abstract'])
+            self.block_hashes.append((len(df), _rows_digest(new_rows)))
+        return len(new_rows)
+
+    # --- Searching ---
+    def search(self, query, k=20, allowed=None):
+        """
+        Returns up to k (document id, score) pairs for the query, best first.
+        Every query term contributes to the BM25 score; documents need not contain all of them.
+        If given, `allowed` is a boolean array over document ids, and only allowed documents are returned.
+        """
+        doc_count = len(self.doc_lengths)
+        if doc_count == 0:
+            return []
+        doc_lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)
+        average_length = self.total_length / doc_count
+
+        ids_parts, score_parts = [], []
+        for term in set(tokenize(query, self.stop_words)):
+            if term not in self.postings:
+                continue
+            ids, freqs = self.postings[term]
+            ids = np.frombuffer(ids, dtype=np.uint32)
+            freqs = np.frombuffer(freqs, dtype=np.uint16).astype(np.float32)
+            idf = math.log(1 + (doc_count - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[ids] / average_length)
+            ids_parts.append(ids)
+            score_parts.append(idf * freqs * (BM25_K1 + 1) / (freqs + norm))
+
+        if not ids_parts:
+            return []
+        # Sum the per-term contributions of each matching document
+        doc_ids, inverse = np.unique(np.concatenate(ids_parts), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+        if allowed is not None:
+            keep = allowed[doc_ids]
+            doc_ids, scores = doc_ids[keep], scores[keep]
+
+        k = min(k, len(doc_ids))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(doc_ids[i]), float(scores[i])) for i in best]
+
+    def search_frame(self, df, query, k=20, start_year=None, end_year=None):
+        """
+        Returns the matching rows of df with a 'score' column, best first,
+        optionally restricted to a year range.
+        """
+        # The year filter is applied before picking the top k, so a narrow range still gets k rows
+        allowed = None
+        if start_year is not None or end_year is not None:
+            years = df['year'].to_numpy()[:len(self)]
+            allowed = np.ones(len(years), dtype=bool)
+            if start_year is not None:
+                allowed &= years >= start_year
+            if end_year is not None:
+                allowed &= years <= end_year
+        hits = self.search(query, k=k, allowed=allowed)
+        if not hits:
+            return df.iloc[[]].assign(score=[])
+        ids, scores = zip(*hits)
+        return df.iloc[list(ids)].assign(score=scores)
+
+    # --- Persistence ---
+    def save(self, path):
+        """Writes the index to path (atomically, via a temporary file)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        state = {
+            'version': INDEX_VERSION,
+            'stop_words': self.stop_words,
+            'postings': dict(self.postings),
+            'doc_lengths': self.doc_lengths,
+            'total_length': self.total_length,
+            'block_hashes': self.block_hashes,
+        }
+        # A unique temporary name, so two processes saving at once cannot mix their files
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Reads an index written by save(). Returns None if it is missing or outdated."""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if state.get('version') != INDEX_VERSION:
+            return None
+
+        index = cls(state['stop_words'])
+        index.postings.update(state['postings'])
+        index.doc_lengths = state['doc_lengths']
+        index.total_length = state['total_length']
+        index.block_hashes = state['block_hashes']
+        return index
+
+
+def _rows_digest(rows):
+    """A content hash of the title and abstract of every row, in order."""
+    row_hashes = pd.util.hash_pandas_object(rows[['title', 'abstract']], index=False)
+    return hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+
+
+def load_or_build_index(df, path):
+    """
+    Loads the persisted index at path and indexes any rows appended to df since
+    it was saved, or builds it from scratch if it is missing or out of date.
+    Returns (index, number of rows indexed during this call).
+    """
+    index = SearchIndex.load(path)
+    added = index.update(df) if index is not None else None
+    if added is None:
+        index = SearchIndex()
+        added = index.update(df)
+    if added:
+        index.save(path)
+    return index, added
+
+
+def benchmark_queries(index, queries, repeat=5):
+    """
+    Runs every query `repeat` times and prints the median and worst latency in milliseconds.
+    Returns a dict of query -> (median ms, max ms, number of hits).
+    """
+    results = {}
+    print(f"{'query':<35} {'median ms':>10} {'max ms':>8} {'hits':>6}")
+    for query in queries:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        median = timings[len(timings) // 2]
+        results[query] = (median, timings[-1], len(hits))
+        print(f"{query:<35} {median:>10.2f} {timings[-1]:>8.2f} {len(hits):>6}")
+    return results
+
+
+# --- Command Line Entry Point ---
+#   python search_index.py metadata.csv "viral transmission" "vaccine efficacy"
+if __name__ == "__main__":
+    import argparse
+
+    from data_loader import CACHE_DIR_NAME, load_cleaned_metadata
+
+    parser = argparse.ArgumentParser(description="Build/update the CORD-19 search index and time some queries")
+    parser.add_argument('file_path', nargs='?', default='metadata.csv')
+    parser.add_argument('queries', nargs='*', default=['coronavirus', 'viral transmission', 'vaccine efficacy trial'])
+    args = parser.parse_args()
+
+    metadata, _ = load_cleaned_metadata(args.file_path)
+    index_path = os.path.join(os.path.dirname(os.path.abspath(args.file_path)), CACHE_DIR_NAME, 'search-index.pkl')
+
+    start = time.perf_counter()
+    search_index, indexed = load_or_build_index(metadata, index_path)
+    print(f"Index ready: {len(search_index):,} documents ({indexed:,} newly indexed) in {time.perf_counter() - start:.2f}s")
+    benchmark_queries(search_index, args.queries)
@@ -0,0 +1,146 @@
+# word_counts.py
+
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from data_loader import DEFAULT_CHUNKSIZE, load_metadata_chunked_iter
+
+
+# The same stop words used for the title word cloud in Data_Analysis.ipynb
+STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'of', 'in', 'and', 'for', 'to', 'on', 'with',
+    'is', 'are', 'was', 'were', 'by', 'as', 'at', 'from',
+])
+
+# Letters/digits with inner hyphens or apostrophes, so 'covid-19' stays one term
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+WORD_PATTERN = r'\S+'
+
+
+def tokenize(text, stop_words=STOP_WORDS):
+    """Yields the lower-cased terms of text one at a time, skipping stop words."""
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        term = match.group()
+        if term not in stop_words:
+            yield term
+
+
+def word_count_series(texts):
+    """
+    Returns the whitespace word count of every string in a pandas Series.
+    Equivalent to .str.split().str.len() but counts matches instead of
+    building a Python list per abstract.
+    """
+    return texts.str.count(WORD_PATTERN)
+
+
+class TermCounter:
+    """
+    Incremental term frequencies over a stream of titles or abstracts.
+
+    Texts are tokenized one at a time into a Counter (overall) and one Counter
+    per year, so memory grows with the vocabulary, not the corpus.
+    Counters built by separate workers can be combined with merge().
+    """
+
+    def __init__(self, stop_words=STOP_WORDS):
+        self.stop_words = frozenset(stop_words)
+        self.total = Counter()
+        self.by_year = defaultdict(Counter)
+        self.documents = 0
+
+    def update(self, text, year=None):
+        """Adds the terms of a single text, optionally attributed to a year."""
+        terms = Counter(tokenize(text, self.stop_words))
+        self.total.update(terms)
+        if year is not None:
+            self.by_year[int(year)].update(terms)
+        self.documents += 1
+
+    def update_frame(self, df, column, year_column='year'):
+        """Adds every text in df[column], using df[year_column] for the per-year breakdown."""
+        texts = df[column].dropna()
+        years = df.loc[texts.index, year_column] if year_column in df else [None] * len(texts)
+        for text, year in zip(texts, years):
+            self.update(text, year)
+        return self
+
+    def merge(self, other):
+        """Adds the counts of another TermCounter into this one and returns self."""
+        self.total.update(other.total)
+        for year, counts in other.by_year.items():
+            self.by_year[year].update(counts)
+        self.documents += other.documents
+        return self
+
+    def most_common(self, n=20, year=None):
+        """Returns the n most frequent terms overall, or for a single year."""
+        counts = self.total if year is None else self.by_year.get(year, Counter())
+        return counts.most_common(n)
+
+    def to_wordcloud(self, max_words=200, **wordcloud_kwargs):
+        """
+        Builds a WordCloud from the accumulated frequencies instead of from one
+        giant joined string. Requires the optional 'wordcloud' package.
+        """
+        from wordcloud import WordCloud
+
+        frequencies = dict(self.total.most_common(max_words))
+        wordcloud_kwargs.setdefault('width', 800)
+        wordcloud_kwargs.setdefault('height', 400)
+        wordcloud_kwargs.setdefault('background_color', 'white')
+        return WordCloud(max_words=max_words, **wordcloud_kwargs).generate_from_frequencies(frequencies)
+
+
+# --- Parallel Counting ---
+def _count_chunk(chunk, column):
+    """Worker function: counts the terms of one chunk of cleaned metadata."""
+    return TermCounter().update_frame(chunk, column)
+
+
+def count_terms(file_path, column='title', workers=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams metadata.csv in chunks and counts the terms of one column across
+    a process pool, merging each worker's counts as they complete.
+    workers=1 counts in the current process.
+    """
+    result = TermCounter()
+    chunks = load_metadata_chunked_iter(file_path, chunksize=chunksize)
+
+    if workers == 1:
+        for _, chunk in chunks:
+            result.update_frame(chunk, column)
+        return result
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep only a couple of chunks per worker in flight so memory stays bounded
+        max_pending = 2 * workers
+        pending = []
+        for _, chunk in chunks:
+            pending.append(executor.submit(_count_chunk, chunk, column))
+            if len(pending) >= max_pending:
+                result.merge(pending.pop(0).result())
+        for future in pending:
+            result.merge(future.result())
+    return result
+
+
+# --- Command Line Entry Point ---
+#   python word_counts.py metadata.csv --column abstract --workers 8
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count the most frequent terms in CORD-19 titles or abstracts")
+    parser.add_argument('file_path', nargs='?', default='metadata.csv')
+    parser.add_argument('--column', choices=['title', 'abstract'], default='title')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    counter = count_terms(args.file_path, column=args.column, workers=args.workers)
+    print(f"Counted {counter.documents:,} documents, {len(counter.total):,} distinct terms")
+    for term, count in counter.most_common(args.top):
+        print(f"{term:<30} {count:>12,}")
@@ -0,0 +1,186 @@
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from python_functions import calculate_discount
+
+
+# Discounts below this percentage are not applied (same rule as calculate_discount)
+DISCOUNT_THRESHOLD = 20
+CSV_CHUNKSIZE = 1_000_000
+# Scaled values this close to a half are rounded with Decimal instead of float math
+ROUNDING_BAND = 1e-6
+# Above this size a scaled float64 no longer holds its fraction precisely enough
+EXACT_FLOAT_LIMIT = 1e9
+
+
+def round_half_up(values, decimals=2):
+  """
+  Rounds an array to `decimals` places the way a person (or decimal.ROUND_HALF_UP)
+  would: 1.005 -> 1.01 and 2.675 -> 2.68, even though those numbers are stored
+  in binary as 1.00499999... and 2.67499999...
+
+  Plain np.round rounds half to even and works on the binary value, so it
+  gives 1.0 and 2.67. Here every value is rounded half-up in float math, and
+  the few values whose scaled fraction lies within ROUNDING_BAND of a half
+  (where the binary error could tip the result either way), or that are too
+  large for float math to be exact, are redone with Decimal on their shortest
+  repr. The result always equals
+  float(Decimal(repr(x)).quantize(Decimal(10) ** -decimals, ROUND_HALF_UP)).
+  """
+  values = np.asarray(values, dtype=np.float64)
+  flat = values.ravel()
+  scale = 10.0 ** decimals
+  scaled = flat * scale
+  result = np.copysign(np.floor(np.abs(scaled) + 0.5), scaled) / scale
+
+  with np.errstate(invalid='ignore'):
+    distance_to_half = np.abs(np.abs(scaled) % 1 - 0.5)
+    unsure = np.isfinite(scaled) & ((distance_to_half < ROUNDING_BAND) | (np.abs(scaled) >= EXACT_FLOAT_LIMIT))
+  if unsure.any():
+    quantum = Decimal(10) ** -decimals
+    result[unsure] = [
+      float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP)) for value in flat[unsure].tolist()
+    ]
+  return result.reshape(values.shape)
+
+
+def check_rounding(count=100_000, decimals=2, seed=0):
+  """
+  Compares round_half_up with Decimal ROUND_HALF_UP on known tricky values and
+  on random prices sitting on or right next to a half cent. Raises AssertionError
+  on the first mismatch and returns the number of values checked.
+  """
+  quantum = Decimal(10) ** -decimals
+
+  def expected(value):
+    return float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+  tricky = [0.1249999995, 0.124999999, 0.125, 0.1250000001, 1.005, 2.675, 1.015, 0.285,
+            -1.005, -2.675, -0.125, 0.0, 999_999.995, 123_456_789.125, 1e15 + 0.5, 4.35, 4.345]
+  rng = np.random.default_rng(seed)
+  cents = rng.integers(0, 10_000_000, count)
+  nudges = rng.choice([-1e-9, -5e-10, 0.0, 5e-10, 1e-9], count)
+  randoms = ((cents + 0.5) / 100 + nudges).tolist()
+  values = tricky + randoms + [-value for value in randoms[:1000]]
+
+  got = round_half_up(values, decimals).tolist()
+  for value, rounded in zip(values, got):
+    assert rounded == expected(value), f"round_half_up({value!r}) gave {rounded!r}, Decimal gives {expected(value)!r}"
+  return len(values)
+
+
+def calculate_discounts(prices, discount_percents, decimals=None):
+  """
+  Batch version of calculate_discount.
+
+  Args:
+    prices: An array (or list) of original prices.
+    discount_percents: An array of discount percentages, or a single percentage for every item.
+    decimals: If given, round the final prices half-up to this many places (e.g. 2 for cents).
+
+  Returns:
+    A float64 NumPy array with the discounted price where the discount is 20% or higher,
+    and the original price everywhere else.
+  """
+  prices = np.asarray(prices, dtype=np.float64)
+  discount_percents = np.asarray(discount_percents, dtype=np.float64)
+
+  # Same arithmetic as the scalar function, so the results are identical before rounding
+  discounted = prices - prices * (discount_percents / 100)
+  final_prices = np.where(discount_percents >= DISCOUNT_THRESHOLD, discounted, prices)
+
+  if decimals is not None:
+    final_prices = round_half_up(final_prices, decimals)
+  return final_prices
+
+
+def reprice_csv(input_path, output_path, price_column='price', discount_column='discount_percent',
+                output_column='final_price', decimals=2, chunksize=CSV_CHUNKSIZE):
+  """
+  Streams a CSV of line items through calculate_discounts, one chunk at a time, and writes
+  it back out with an extra `output_column`, so files far larger than memory can be repriced.
+  Returns the number of rows written.
+  """
+  # pandas is only needed for the CSV mode
+  import pandas as pd
+
+  rows = 0
+  reader = pd.read_csv(input_path, chunksize=chunksize)
+  for i, chunk in enumerate(reader):
+    chunk[output_column] = calculate_discounts(
+      chunk[price_column].to_numpy(), chunk[discount_column].to_numpy(), decimals
+    )
+    # The first chunk creates the file with a header, the rest are appended
+    chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    rows += len(chunk)
+  return rows
+
+
+def benchmark(count=1_000_000, seed=0):
+  """
+  Prices `count` random items with calculate_discount in a loop and with
+  calculate_discounts in one call (with and without rounding to cents),
+  checks they agree and prints the throughput.
+  """
+  rng = np.random.default_rng(seed)
+  prices = rng.uniform(1, 500, count).round(2)
+  discounts = rng.integers(0, 50, count).astype(np.float64)
+
+  # The scalar loop gets plain Python numbers, which is how it is normally called
+  price_list, discount_list = prices.tolist(), discounts.tolist()
+  start = time.perf_counter()
+  scalar_results = [calculate_discount(p, d) for p, d in zip(price_list, discount_list)]
+  scalar_seconds = time.perf_counter() - start
+
+  start = time.perf_counter()
+  batch_results = calculate_discounts(prices, discounts)
+  batch_seconds = time.perf_counter() - start
+
+  start = time.perf_counter()
+  rounded_results = calculate_discounts(prices, discounts, decimals=2)
+  rounded_seconds = time.perf_counter() - start
+
+  assert np.array_equal(batch_results, np.array(scalar_results)), "batch and scalar prices differ"
+  # Rounding the scalar results one by one with Decimal gives exactly the same cents
+  quantum = Decimal('0.01')
+  expected = [float(Decimal(repr(price)).quantize(quantum, rounding=ROUND_HALF_UP)) for price in scalar_results]
+  assert np.array_equal(rounded_results, np.array(expected)), "rounded batch prices differ from Decimal"
+  print(f"{'method':<8} {'seconds':>9} {'items/sec':>15}")
+  print(f"{'scalar':<8} {scalar_seconds:>9.3f} {count / scalar_seconds:>15,.0f}")
+  print(f"{'batch':<8} {batch_seconds:>9.3f} {count / batch_seconds:>15,.0f}")
+  print(f"{'rounded':<8} {rounded_seconds:>9.3f} {count / rounded_seconds:>15,.0f}")
+  print(f"speedup: {scalar_seconds / batch_seconds:.0f}x")
+  return scalar_seconds, batch_seconds
+
+
+# --- Command Line Entry Point ---
+#   python batch_pricing.py items.csv repriced.csv
+#   python batch_pricing.py --benchmark
+#   python batch_pricing.py --check
+if __name__ == "__main__":
+  import argparse
+
+  parser = argparse.ArgumentParser(description="Apply the 20% discount rule to a whole CSV of line items")
+  parser.add_argument('input_path', nargs='?')
+  parser.add_argument('output_path', nargs='?')
+  parser.add_argument('--price-column', default='price')
+  parser.add_argument('--discount-column', default='discount_percent')
+  parser.add_argument('--decimals', type=int, default=2)
+  parser.add_argument('--chunksize', type=int, default=CSV_CHUNKSIZE)
+  parser.add_argument('--benchmark', action='store_true')
+  parser.add_argument('--check', action='store_true', help="Compare round_half_up with Decimal on tricky values")
+  args = parser.parse_args()
+
+  if args.check:
+    print(f"round_half_up matches Decimal ROUND_HALF_UP on {check_rounding(decimals=args.decimals):,} values")
+  elif args.benchmark:
+    benchmark()
+  elif args.input_path and args.output_path:
+    start = time.perf_counter()
+    written = reprice_csv(args.input_path, args.output_path, args.price_column, args.discount_column,
+                          decimals=args.decimals, chunksize=args.chunksize)
+    print(f"Repriced {written:,} items in {time.perf_counter() - start:.2f}s")
+  else:
+    parser.error("give an input and output CSV, or --benchmark / --check")
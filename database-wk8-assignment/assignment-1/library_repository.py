@@ -0,0 +1,384 @@
+# library_repository.py
+# Python data access for the LibraryDB schema in library_db.sql.
+# Runs against SQLite, which stands in for MySQL in local tools and tests.
+
+import itertools
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+
+# --- Schema ---
+# The same tables, keys and ON DELETE rules as library_db.sql, in SQLite syntax:
+# INTEGER PRIMARY KEY replaces INT AUTO_INCREMENT, and CURRENT_DATE replaces CURDATE().
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Genres (
+    GenreID INTEGER PRIMARY KEY,
+    GenreName VARCHAR(100) NOT NULL UNIQUE,
+    Description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Authors (
+    AuthorID INTEGER PRIMARY KEY,
+    FirstName VARCHAR(100) NOT NULL,
+    LastName VARCHAR(100) NOT NULL,
+    BirthDate DATE
+);
+
+CREATE TABLE IF NOT EXISTS Members (
+    MemberID INTEGER PRIMARY KEY,
+    FirstName VARCHAR(100) NOT NULL,
+    LastName VARCHAR(100) NOT NULL,
+    Email VARCHAR(255) NOT NULL UNIQUE,
+    PhoneNumber VARCHAR(20),
+    MembershipDate DATE NOT NULL DEFAULT CURRENT_DATE
+);
+
+CREATE TABLE IF NOT EXISTS Books (
+    BookID INTEGER PRIMARY KEY,
+    Title VARCHAR(255) NOT NULL,
+    ISBN VARCHAR(20) NOT NULL UNIQUE,
+    PublishedDate DATE,
+    TotalCopies INT NOT NULL DEFAULT 1,
+    AvailableCopies INT NOT NULL DEFAULT 1,
+    GenreID INT,
+    CONSTRAINT fk_book_genre
+        FOREIGN KEY (GenreID) REFERENCES Genres(GenreID) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS BookAuthors (
+    BookID INT,
+    AuthorID INT,
+    PRIMARY KEY (BookID, AuthorID),
+    CONSTRAINT fk_bookauthors_book
+        FOREIGN KEY (BookID) REFERENCES Books(BookID) ON DELETE CASCADE,
+    CONSTRAINT fk_bookauthors_author
+        FOREIGN KEY (AuthorID) REFERENCES Authors(AuthorID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Loans (
+    LoanID INTEGER PRIMARY KEY,
+    BookID INT NOT NULL,
+    MemberID INT NOT NULL,
+    LoanDate DATE NOT NULL DEFAULT CURRENT_DATE,
+    DueDate DATE NOT NULL,
+    ReturnDate DATE,
+    CONSTRAINT fk_loan_book
+        FOREIGN KEY (BookID) REFERENCES Books(BookID) ON DELETE RESTRICT,
+    CONSTRAINT fk_loan_member
+        FOREIGN KEY (MemberID) REFERENCES Members(MemberID) ON DELETE CASCADE
+);
+
+-- SQLite does not index foreign keys automatically (MySQL's InnoDB does)
+CREATE INDEX IF NOT EXISTS idx_books_genre ON Books(GenreID);
+CREATE INDEX IF NOT EXISTS idx_bookauthors_author ON BookAuthors(AuthorID);
+CREATE INDEX IF NOT EXISTS idx_loans_book ON Loans(BookID);
+CREATE INDEX IF NOT EXISTS idx_loans_member ON Loans(MemberID);
+"""
+
+
+# --- SQL Statements ---
+# Every statement is a constant string with ? placeholders. sqlite3 keeps a cache
+# of prepared statements per connection, keyed by the SQL text, so reusing the
+# same strings means each statement is parsed once per connection, not per call.
+INSERT_GENRE = "INSERT INTO Genres (GenreName, Description) VALUES (?, ?)"
+INSERT_AUTHOR = "INSERT INTO Authors (FirstName, LastName, BirthDate) VALUES (?, ?, ?)"
+INSERT_MEMBER = "INSERT INTO Members (FirstName, LastName, Email, PhoneNumber) VALUES (?, ?, ?, ?)"
+INSERT_BOOK = (
+    "INSERT INTO Books (Title, ISBN, PublishedDate, TotalCopies, AvailableCopies, GenreID) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+INSERT_BOOK_AUTHOR = "INSERT INTO BookAuthors (BookID, AuthorID) VALUES (?, ?)"
+# A missing loan date falls back to today, like the column default
+INSERT_LOAN = (
+    "INSERT INTO Loans (BookID, MemberID, LoanDate, DueDate, ReturnDate) "
+    "VALUES (?, ?, COALESCE(?, CURRENT_DATE), ?, ?)"
+)
+SELECT_BOOK = "SELECT * FROM Books WHERE BookID = ?"
+SELECT_BOOKS_BY_AUTHOR = (
+    "SELECT b.* FROM Books b JOIN BookAuthors ba ON ba.BookID = b.BookID "
+    "WHERE ba.AuthorID = ? ORDER BY b.Title"
+)
+SELECT_OPEN_LOANS = "SELECT * FROM Loans WHERE MemberID = ? AND ReturnDate IS NULL ORDER BY DueDate"
+RETURN_LOAN = "UPDATE Loans SET ReturnDate = COALESCE(?, CURRENT_DATE) WHERE LoanID = ? AND ReturnDate IS NULL"
+
+STATEMENT_CACHE_SIZE = 128
+BULK_BATCH_SIZE = 10_000
+
+
+# --- Connection Pool ---
+def sqlite_connect(database):
+    """
+    Opens a SQLite connection set up like the MySQL database:
+    foreign keys enforced, rows returned as dict-like sqlite3.Row objects.
+    """
+    connection = sqlite3.connect(
+        database,
+        check_same_thread=False,  # the pool hands connections to different threads
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA foreign_keys = ON")
+    if database != ':memory:':
+        # WAL lets readers work while a bulk load is writing
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of database connections, like the mysql2 pool used by the
+    library API. Connections are opened lazily up to `size` and reused, so callers
+    do not pay for connecting (or lose their prepared statements) on every call.
+    """
+
+    def __init__(self, database, size=5, connect=sqlite_connect, timeout=30):
+        self.database = database
+        # Every connection to ':memory:' is a separate, empty database, so share just one
+        self.size = 1 if database == ':memory:' else size
+        self.timeout = timeout
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._connect(self.database)
+                except Exception:
+                    self._opened -= 1
+                    raise
+        # Every connection is busy: wait for one to come back
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no database connection became free within {self.timeout}s") from None
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrows a connection for one transaction: it is committed if the block
+        succeeds, rolled back if it raises, and returned to the pool either way.
+        """
+        if self._closed:
+            raise RuntimeError("the connection pool is closed")
+        connection = self._acquire()
+        try:
+            yield connection
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            if self._closed:
+                connection.close()
+            else:
+                self._idle.put(connection)
+
+    def close(self):
+        """Closes every idle connection. Connections still borrowed are closed when returned."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# --- Repository ---
+def _batches(rows, size):
+    """Splits any iterable of rows into lists of at most `size`, so huge loads are not held in memory."""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class LibraryRepository:
+    """
+    Reads and writes the LibraryDB tables through a ConnectionPool.
+
+    The single-row methods (add_book, add_loan, ...) each run in their own
+    transaction. The bulk_* methods load any number of rows with executemany
+    inside one transaction, which is far faster than inserting row by row.
+    """
+
+    def __init__(self, pool, batch_size=BULK_BATCH_SIZE):
+        self.pool = pool
+        self.batch_size = batch_size
+
+    def create_schema(self):
+        with self.pool.connection() as connection:
+            connection.executescript(SQLITE_SCHEMA)
+
+    # --- Single-row writes ---
+    def add_genre(self, genre_name, description=None):
+        with self.pool.connection() as connection:
+            return connection.execute(INSERT_GENRE, (genre_name, description)).lastrowid
+
+    def add_author(self, first_name, last_name, birth_date=None):
+        with self.pool.connection() as connection:
+            return connection.execute(INSERT_AUTHOR, (first_name, last_name, birth_date)).lastrowid
+
+    def add_member(self, first_name, last_name, email, phone_number=None):
+        with self.pool.connection() as connection:
+            return connection.execute(INSERT_MEMBER, (first_name, last_name, email, phone_number)).lastrowid
+
+    def add_book(self, title, isbn, published_date=None, total_copies=1, available_copies=None,
+                 genre_id=None, author_ids=()):
+        """Adds a book and links it to its authors in the same transaction. Returns the BookID."""
+        if available_copies is None:
+            available_copies = total_copies
+        with self.pool.connection() as connection:
+            book_id = connection.execute(
+                INSERT_BOOK, (title, isbn, published_date, total_copies, available_copies, genre_id)
+            ).lastrowid
+            connection.executemany(INSERT_BOOK_AUTHOR, ((book_id, author_id) for author_id in author_ids))
+        return book_id
+
+    def add_loan(self, book_id, member_id, due_date, loan_date=None):
+        with self.pool.connection() as connection:
+            return connection.execute(INSERT_LOAN, (book_id, member_id, loan_date, due_date, None)).lastrowid
+
+    def return_loan(self, loan_id, return_date=None):
+        """Marks a loan as returned. Returns False if it does not exist or was already returned."""
+        with self.pool.connection() as connection:
+            return connection.execute(RETURN_LOAN, (return_date, loan_id)).rowcount == 1
+
+    # --- Bulk writes ---
+    def _bulk_insert(self, sql, rows):
+        inserted = 0
+        with self.pool.connection() as connection:
+            for batch in _batches(rows, self.batch_size):
+                connection.executemany(sql, batch)
+                inserted += len(batch)
+        return inserted
+
+    def bulk_add_authors(self, authors):
+        """Inserts (FirstName, LastName, BirthDate) tuples in one transaction. Returns the row count."""
+        return self._bulk_insert(INSERT_AUTHOR, authors)
+
+    def bulk_add_books(self, books):
+        """
+        Inserts (Title, ISBN, PublishedDate, TotalCopies, AvailableCopies, GenreID)
+        tuples in one transaction. Returns the row count.
+        """
+        return self._bulk_insert(INSERT_BOOK, books)
+
+    def bulk_add_book_authors(self, pairs):
+        """Inserts (BookID, AuthorID) links in one transaction. Returns the row count."""
+        return self._bulk_insert(INSERT_BOOK_AUTHOR, pairs)
+
+    def bulk_add_loans(self, loans):
+        """
+        Inserts (BookID, MemberID, LoanDate, DueDate, ReturnDate) tuples in one
+        transaction; a None LoanDate means today. Returns the row count.
+        """
+        return self._bulk_insert(INSERT_LOAN, loans)
+
+    # --- Reads ---
+    def get_book(self, book_id):
+        with self.pool.connection() as connection:
+            row = connection.execute(SELECT_BOOK, (book_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def books_by_author(self, author_id):
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(SELECT_BOOKS_BY_AUTHOR, (author_id,))]
+
+    def open_loans(self, member_id):
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(SELECT_OPEN_LOANS, (member_id,))]
+
+
+# --- Benchmark ---
+def benchmark(count=20_000, database_dir=None):
+    """
+    Loads `count` authors, books, book-author links and loans into a fresh
+    SQLite file, once row by row (one transaction per row, like the current
+    tooling) and once with the bulk methods, and prints the rows/sec of each.
+    """
+    def sample_rows(offset):
+        authors = [(f"First{i}", f"Last{i}", "1970-01-01") for i in range(count)]
+        books = [(f"Book {i}", f"ISBN-{offset}-{i}", "2020-01-01", 3, 3, None) for i in range(count)]
+        links = [(offset + i + 1, offset + i + 1) for i in range(count)]
+        loans = [(offset + i + 1, 1, None, "2030-01-01", None) for i in range(count)]
+        return authors, books, links, loans
+
+    with tempfile.TemporaryDirectory(dir=database_dir) as work_dir:
+        pool = ConnectionPool(os.path.join(work_dir, 'library.db'), size=4)
+        repository = LibraryRepository(pool)
+        repository.create_schema()
+        repository.add_member("Bench", "Mark", "bench@example.com")
+
+        def single(table_rows):
+            authors, books, links, loans = table_rows
+            for author in authors:
+                repository.add_author(*author)
+            for title, isbn, published, total, available, genre_id in books:
+                repository.add_book(title, isbn, published, total, available, genre_id)
+            for pair in links:
+                repository.bulk_add_book_authors([pair])
+            for book_id, member_id, loan_date, due_date, _ in loans:
+                repository.add_loan(book_id, member_id, due_date, loan_date)
+
+        def bulk(table_rows):
+            authors, books, links, loans = table_rows
+            repository.bulk_add_authors(authors)
+            repository.bulk_add_books(books)
+            repository.bulk_add_book_authors(links)
+            repository.bulk_add_loans(loans)
+
+        print(f"{'method':<8} {'rows':>8} {'seconds':>9} {'rows/sec':>12}")
+        results = {}
+        # Both runs insert the same number of rows; the second uses new IDs and ISBNs
+        for label, load, offset in (("single", single, 0), ("bulk", bulk, count)):
+            table_rows = sample_rows(offset)
+            start = time.perf_counter()
+            load(table_rows)
+            elapsed = time.perf_counter() - start
+            rows = count * 4
+            results[label] = rows / elapsed
+            print(f"{label:<8} {rows:>8,} {elapsed:>9.2f} {rows / elapsed:>12,.0f}")
+        print(f"speedup: {results['bulk'] / results['single']:.0f}x")
+        pool.close()
+    return results
+
+
+# --- Command Line Entry Point ---
+#   python library_repository.py            # quick demo on an in-memory database
+#   python library_repository.py --benchmark 20000
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 20_000)
+    else:
+        pool = ConnectionPool(':memory:')
+        library = LibraryRepository(pool)
+        library.create_schema()
+        genre_id = library.add_genre("Fantasy", "Magic and adventure")
+        author_id = library.add_author("J.R.R.", "Tolkien", "1892-01-03")
+        book_id = library.add_book("The Hobbit", "978-0547928227", "1937-09-21", 3, genre_id=genre_id,
+                                   author_ids=[author_id])
+        member_id = library.add_member("Ada", "Lovelace", "ada@example.com")
+        library.add_loan(book_id, member_id, "2030-01-01")
+        print(library.get_book(book_id))
+        print(library.books_by_author(author_id))
+        print(library.open_loans(member_id))
+        pool.close()
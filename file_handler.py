@@ -1,4 +1,14 @@
+import codecs
+import glob
+import mmap
 import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Read and write in large blocks so huge files are processed with constant memory
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
 
 def file_processor():
     """
@@ -56,8 +66,469 @@ def file_processor():
         print("Please check the file name and try again.")
 
 
+# --- Streaming Mode ---
+def _is_ascii_compatible(encoding):
+    """True if the encoding writes digits, ':' and newlines as single ASCII bytes (UTF-8, Latin-1, ...)."""
+    return "0: x\n".encode(encoding) == b"0: x\n"
+
+
+def _number_byte_lines(read_block, write, block_size, first_line=1):
+    """
+    Numbers the lines of a binary stream without decoding them, starting at first_line.
+    Lines are kept byte-for-byte (including '\r\n' endings and invalid UTF-8).
+    Returns (lines written, bytes read).
+    """
+    line_number = first_line - 1
+    bytes_read = 0
+    pending = b""
+    while True:
+        block = read_block(block_size)
+        if not block:
+            break
+        bytes_read += len(block)
+        lines = (pending + block).split(b"\n")
+        # The last piece has no newline yet; keep it for the next block
+        pending = lines.pop()
+        write(b"".join([b"%d: %s\n" % (number, line) for number, line in enumerate(lines, start=line_number + 1)]))
+        line_number += len(lines)
+    if pending:
+        # Like the original, a last line without a newline is written without one
+        line_number += 1
+        write(b"%d: %s" % (line_number, pending))
+    return line_number - (first_line - 1), bytes_read
+
+
+def _number_text_lines(read_block, write, block_size):
+    """Same as _number_byte_lines for already decoded text (used for UTF-16 and friends)."""
+    line_number = 0
+    chars_read = 0
+    pending = ""
+    while True:
+        block = read_block(block_size)
+        if not block:
+            break
+        chars_read += len(block)
+        lines = (pending + block).split("\n")
+        pending = lines.pop()
+        write("".join([f"{number}: {line}\n" for number, line in enumerate(lines, start=line_number + 1)]))
+        line_number += len(lines)
+    if pending:
+        line_number += 1
+        write(f"{line_number}: {pending}")
+    return line_number, chars_read
+
+
+def _decoding_reader(read_bytes, encoding):
+    """
+    Turns a binary read function into one that returns decoded text (without
+    newline translation). Returns (read function, [bytes read so far]).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    bytes_read = [0]
+
+    def read_block(size):
+        while True:
+            data = read_bytes(size)
+            bytes_read[0] += len(data)
+            text = decoder.decode(data, final=not data)
+            # A block can end inside a character; keep reading until there is text or EOF
+            if text or not data:
+                return text
+    return read_block, bytes_read
+
+
+def number_lines_streaming(input_path, output_path=None, encoding=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Adds line numbers to input_path in large blocks, using constant memory
+    however big the file is. '-' reads from stdin / writes to stdout.
+
+    With no encoding (or any ASCII-compatible one such as UTF-8 or Latin-1)
+    the file is processed as raw bytes, so any content is preserved exactly.
+    Other encodings (e.g. UTF-16) are decoded and re-encoded.
+    Returns a stats dict with the line count, bytes read, seconds and MB/s.
+    """
+    if output_path is None:
+        name, ext = os.path.splitext(input_path)
+        output_path = f"{name}_modified{ext}"
+    if encoding is not None:
+        # Normalise the name and fail early on unknown encodings
+        encoding = codecs.lookup(encoding).name
+
+    start = time.perf_counter()
+    binary = encoding is None or _is_ascii_compatible(encoding)
+    # Both sides are always opened as bytes, so '-' works the same for every encoding
+    file_input = sys.stdin.buffer if input_path == '-' else open(input_path, 'rb', buffering=0)
+    file_output = sys.stdout.buffer if output_path == '-' else open(output_path, 'wb', buffering=block_size)
+
+    try:
+        if binary:
+            lines, size = _number_byte_lines(file_input.read, file_output.write, block_size)
+        else:
+            read_text, bytes_read = _decoding_reader(file_input.read, encoding)
+            encoder = codecs.getincrementalencoder(encoding)()
+            lines, _ = _number_text_lines(read_text, lambda text: file_output.write(encoder.encode(text)), block_size)
+            file_output.write(encoder.encode("", final=True))
+            size = bytes_read[0]
+    finally:
+        if file_input is not sys.stdin.buffer:
+            file_input.close()
+        if file_output is sys.stdout.buffer:
+            file_output.flush()
+        else:
+            file_output.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'input': input_path,
+        'output': output_path,
+        'lines': lines,
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+# --- Parallel Mode ---
+def expand_paths(patterns):
+    """Expands paths and glob patterns (including '**') into a sorted, de-duplicated list of files."""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        paths.update(path for path in matches if not os.path.isdir(path))
+    return sorted(paths)
+
+
+def _number_file_safely(path, encoding, block_size):
+    """Worker function for number_many_files: returns stats, or an error message instead of raising."""
+    try:
+        return number_lines_streaming(path, encoding=encoding, block_size=block_size)
+    except (OSError, LookupError, UnicodeError) as e:
+        return {'input': path, 'error': str(e)}
+
+
+def number_many_files(patterns, workers=None, encoding=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Numbers every file matched by the given paths/globs on a process pool.
+    Each file is written to its own <name>_modified<ext>. Returns a list of stats dicts.
+    """
+    paths = expand_paths(patterns)
+    # A pattern like '*.txt' also matches the outputs of an earlier run; those are
+    # skipped only when this run would overwrite them with another input's output
+    outputs = {"{}_modified{}".format(*os.path.splitext(path)) for path in paths}
+    skipped = [path for path in paths if path in outputs]
+    for path in skipped:
+        print(f"Skipping '{path}': it is the output of another input", file=sys.stderr)
+    paths = [path for path in paths if path not in outputs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            _number_file_safely, paths, [encoding] * len(paths), [block_size] * len(paths), chunksize=16,
+        ))
+
+
+def find_line_ranges(input_path, parts):
+    """
+    Splits a file into at most `parts` byte ranges that each end right after a newline
+    (except the last one). Returns a list of (start, end) offsets.
+    """
+    size = os.path.getsize(input_path)
+    boundaries = [0]
+    with open(input_path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, boundaries[-1]))
+            # Move to just after the next newline so no line is split between ranges
+            f.readline()
+            offset = f.tell()
+            if offset >= size:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _range_reader(f, start, end):
+    """Returns a read_block function that reads [start, end) of an open binary file."""
+    f.seek(start)
+    remaining = [end - start]
+
+    def read_block(size):
+        block = f.read(min(size, remaining[0]))
+        remaining[0] -= len(block)
+        return block
+    return read_block
+
+
+def _count_newlines(input_path, start, end, block_size=DEFAULT_BLOCK_SIZE):
+    """Worker function: counts the newlines in a byte range."""
+    count = 0
+    with open(input_path, 'rb', buffering=0) as f:
+        read_block = _range_reader(f, start, end)
+        for block in iter(lambda: read_block(block_size), b""):
+            count += block.count(b"\n")
+    return count
+
+
+def _number_range(input_path, shard_path, start, end, first_line, block_size=DEFAULT_BLOCK_SIZE):
+    """Worker function: numbers the lines of one byte range into its own shard file."""
+    with open(input_path, 'rb', buffering=0) as f_in, open(shard_path, 'wb', buffering=block_size) as f_out:
+        lines, _ = _number_byte_lines(_range_reader(f_in, start, end), f_out.write, block_size, first_line)
+    return lines
+
+
+def number_lines_sharded(input_path, output_path=None, workers=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Numbers one huge file on a process pool:
+      1. split it into newline-aligned byte ranges,
+      2. count the lines of every range in parallel to get each range's first line number,
+      3. number every range into a shard file in parallel,
+      4. concatenate the shards into <name>_modified<ext>.
+    The output is identical to number_lines_streaming(). Returns a stats dict.
+    """
+    if output_path is None:
+        name, ext = os.path.splitext(input_path)
+        output_path = f"{name}_modified{ext}"
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    ranges = find_line_ranges(input_path, workers)
+    shard_paths = [f"{output_path}.part{i}" for i in range(len(ranges))]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(
+                _count_newlines, [input_path] * len(ranges), *zip(*ranges),
+            ))
+            first_lines = []
+            next_line = 1
+            for count in counts:
+                first_lines.append(next_line)
+                next_line += count
+
+            lines = sum(executor.map(
+                _number_range, [input_path] * len(ranges), shard_paths, *zip(*ranges), first_lines,
+            ))
+
+        with open(output_path, 'wb') as f_out:
+            for shard_path in shard_paths:
+                with open(shard_path, 'rb') as f_shard:
+                    shutil.copyfileobj(f_shard, f_out, block_size)
+    finally:
+        for shard_path in shard_paths:
+            if os.path.exists(shard_path):
+                os.remove(shard_path)
+
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(input_path)
+    return {
+        'input': input_path,
+        'output': output_path,
+        'lines': lines,
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf'),
+        'workers': workers,
+    }
+
+
+def benchmark_scaling(input_path, worker_counts=None):
+    """Times the single-process streaming mode and the sharded mode for several worker counts."""
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+
+    baseline = number_lines_streaming(input_path)
+    print(f"{'mode':<14} {'seconds':>8} {'MB/s':>8} {'speedup':>8}")
+    print(f"{'streaming':<14} {baseline['seconds']:>8.2f} {baseline['mb_per_sec']:>8.1f} {1:>7.2f}x")
+    for workers in worker_counts:
+        stats = number_lines_sharded(input_path, workers=workers)
+        speedup = baseline['seconds'] / stats['seconds'] if stats['seconds'] > 0 else float('inf')
+        print(f"{f'sharded x{workers}':<14} {stats['seconds']:>8.2f} {stats['mb_per_sec']:>8.1f} {speedup:>7.2f}x")
+
+
+# --- Memory-Mapped Mode ---
+def number_lines_mmap(input_path, output_path=None, window_size=DEFAULT_BLOCK_SIZE):
+    """
+    Adds line numbers by scanning a memory-mapped copy of the file instead of read() calls.
+    The map is walked in newline-aligned windows (found with mmap.rfind), so no
+    partial line is ever carried over and nothing is decoded. Each window's
+    numbered lines go out in one bulk write.
+    The output is identical to number_lines_streaming(). Returns a stats dict.
+    """
+    if output_path is None:
+        name, ext = os.path.splitext(input_path)
+        output_path = f"{name}_modified{ext}"
+
+    start = time.perf_counter()
+    size = os.path.getsize(input_path)
+    lines = 0
+    # An empty file cannot be mapped, but still produces an (empty) output file
+    with open(input_path, 'rb') as f_in, open(output_path, 'wb', buffering=0) as f_out:
+        if size:
+            with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    # Lets the kernel read ahead aggressively and drop pages behind us
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                position = 0
+                while position < size:
+                    end = min(position + window_size, size)
+                    if end < size:
+                        newline = mapped.rfind(b"\n", position, end)
+                        # A single line longer than the window: extend to its end
+                        if newline == -1:
+                            newline = mapped.find(b"\n", end)
+                        end = size if newline == -1 else newline + 1
+                    # Split on b"\n" only (not splitlines) so lone '\r' bytes stay inside their line
+                    window_lines = mapped[position:end].split(b"\n")
+                    last = window_lines.pop()
+                    numbers = range(lines + 1, lines + len(window_lines) + 1)
+                    f_out.write(b"".join(map(b"%d: %s\n".__mod__, zip(numbers, window_lines))))
+                    lines += len(window_lines)
+                    if last:
+                        # Only the end of the file can hold a line without a newline
+                        lines += 1
+                        f_out.write(b"%d: %s" % (lines, last))
+                    position = end
+
+    elapsed = time.perf_counter() - start
+    return {
+        'input': input_path,
+        'output': output_path,
+        'lines': lines,
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+def _number_lines_readlines(input_path, output_path):
+    """The original file_processor() read/f-string/write loop, kept as a benchmark baseline."""
+    start = time.perf_counter()
+    with open(input_path, 'r') as file_input:
+        lines = file_input.readlines()
+    with open(output_path, 'w') as file_output:
+        for line_number, line in enumerate(lines, start=1):
+            file_output.write(f"{line_number}: {line}")
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(input_path)
+    return {'lines': len(lines), 'bytes': size, 'seconds': elapsed,
+            'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf')}
+
+
+def benchmark_mmap(input_path=None, size_mb=1024):
+    """
+    Compares the original readlines implementation, the streaming mode and the mmap mode.
+    Without an input file, a size_mb file of log-like lines is generated first.
+    """
+    generated = input_path is None
+    if generated:
+        input_path = f"benchmark_input_{size_mb}mb.txt"
+        line = b"2025-01-01 12:00:00 INFO request handled in 12ms by worker-7 status=200\n"
+        block = line * (DEFAULT_BLOCK_SIZE // len(line))
+        with open(input_path, 'wb') as f:
+            for _ in range(size_mb * 1024 * 1024 // len(block) + 1):
+                f.write(block)
+
+    name, ext = os.path.splitext(input_path)
+    output_path = f"{name}_benchmark{ext}"
+    try:
+        print(f"{'mode':<12} {'seconds':>8} {'MB/s':>8}")
+        for label, run in (
+            ('readlines', lambda: _number_lines_readlines(input_path, output_path)),
+            ('streaming', lambda: number_lines_streaming(input_path, output_path)),
+            ('mmap', lambda: number_lines_mmap(input_path, output_path)),
+        ):
+            stats = run()
+            print(f"{label:<12} {stats['seconds']:>8.2f} {stats['mb_per_sec']:>8.1f}")
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        if generated:
+            os.remove(input_path)
+
+
+def _report(stats):
+    """Prints the result of one run on stderr so stdout can stay part of a pipeline."""
+    if 'error' in stats:
+        print(f"❌ ERROR: {stats['input']}: {stats['error']}", file=sys.stderr)
+        return
+    print(
+        f"Numbered {stats['lines']:,} lines ({stats['bytes'] / (1024 * 1024):,.1f} MB) "
+        f"in {stats['seconds']:.2f}s at {stats['mb_per_sec']:,.1f} MB/s -> {stats['output']}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    """
+    Non-interactive entry point, e.g.
+        python file_handler.py big.log                     -> writes big_modified.log
+        cat big.log | python file_handler.py - -o -        -> numbers stdin to stdout
+        python file_handler.py 'logs/**/*.log' --workers 8 -> every matching file on 8 processes
+        python file_handler.py huge.log --shard --workers 16
+        python file_handler.py huge.log --mmap
+        python file_handler.py huge.log --benchmark
+        python file_handler.py --benchmark-mmap 2048       -> generates a 2 GB file to compare against
+    With no arguments the interactive file_processor() runs as before.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add line numbers to files")
+    parser.add_argument('inputs', nargs='*', help="Files or glob patterns to read, or '-' for stdin")
+    parser.add_argument('-o', '--output', help="File to write, or '-' for stdout (single input only)")
+    parser.add_argument('--encoding', default=None, help="Text encoding (default: process raw bytes)")
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help="Bytes read per block")
+    parser.add_argument('--workers', type=int, default=None, help="Processes to use (default: all CPUs)")
+    parser.add_argument('--shard', action='store_true', help="Split a single huge file across the workers")
+    parser.add_argument('--mmap', action='store_true', help="Number a local file through a memory map")
+    parser.add_argument('--benchmark', action='store_true', help="Compare streaming and sharded mode on one file")
+    parser.add_argument('--benchmark-mmap', type=int, metavar='SIZE_MB', default=None,
+                        help="Compare readlines, streaming and mmap mode (on the input file, or a generated one)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark_mmap is not None:
+        benchmark_mmap(args.inputs[0] if args.inputs else None, args.benchmark_mmap)
+        return 0
+    if not args.inputs:
+        parser.error("at least one input file is required")
+
+    single = len(args.inputs) == 1 and not glob.has_magic(args.inputs[0])
+    if args.output is not None and not single:
+        parser.error("--output can only be used with a single input file")
+    if args.mmap and not single:
+        parser.error("--mmap can only be used with a single input file")
+
+    try:
+        if args.benchmark:
+            benchmark_scaling(args.inputs[0])
+            return 0
+        if single and args.mmap:
+            if args.inputs[0] == '-' or args.output == '-':
+                parser.error("--mmap needs a regular input and output file")
+            # The map is scanned for b"\n" bytes, which is wrong for e.g. UTF-16
+            if args.encoding is not None and not _is_ascii_compatible(codecs.lookup(args.encoding).name):
+                parser.error("--mmap only supports ASCII-compatible encodings")
+            results = [number_lines_mmap(args.inputs[0], args.output, args.block_size)]
+        elif single and args.shard:
+            if args.inputs[0] == '-' or args.output == '-':
+                parser.error("--shard needs a regular input and output file")
+            if args.encoding is not None and not _is_ascii_compatible(codecs.lookup(args.encoding).name):
+                parser.error("--shard only supports ASCII-compatible encodings")
+            results = [number_lines_sharded(args.inputs[0], args.output, args.workers, args.block_size)]
+        elif single:
+            output = '-' if args.inputs[0] == '-' and args.output is None else args.output
+            results = [number_lines_streaming(args.inputs[0], output, args.encoding, args.block_size)]
+        else:
+            results = number_many_files(args.inputs, args.workers, args.encoding, args.block_size)
+    except (OSError, LookupError, UnicodeError) as e:
+        print(f"❌ ERROR: {e}", file=sys.stderr)
+        return 1
+
+    for stats in results:
+        _report(stats)
+    return 1 if any('error' in stats for stats in results) else 0
+
+
 # This line ensures that the function runs only when the script is executed directly
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
     file_processor()
-
-
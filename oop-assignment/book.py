@@ -99,26 +99,27 @@ class EBook(Book):
 
 
 # --- Let's bring our classes to life by creating objects! ---
+# (Only when this file is run directly, so the classes can be imported quietly.)
+if __name__ == "__main__":
+    print("--- Creating a Physical Book Object ---")
+    # Create an instance of the Book class
+    my_book = Book("The Hobbit", "J.R.R. Tolkien", 310, "Fantasy")
 
-print("--- Creating a Physical Book Object ---")
-# Create an instance of the Book class
-my_book = Book("The Hobbit", "J.R.R. Tolkien", 310, "Fantasy")
+    # Use the object's methods
+    print(my_book.get_summary())
+    my_book.open_book()
+    my_book.read_page(75)
+    my_book.close_book()
 
-# Use the object's methods
-print(my_book.get_summary())
-my_book.open_book()
-my_book.read_page(75)
-my_book.close_book()
+    print("\n" + "="*40 + "\n")
 
-print("\n" + "="*40 + "\n")
+    print("--- Creating an EBook Object ---")
+    # Create an instance of the EBook child class
+    my_ebook = EBook("Dune", "Frank Herbert", 412, "Sci-Fi", "EPUB", 5.2)
 
-print("--- Creating an EBook Object ---")
-# Create an instance of the EBook child class
-my_ebook = EBook("Dune", "Frank Herbert", 412, "Sci-Fi", "EPUB", 5.2)
-
-# Use methods from both the parent and child classes
-print(my_ebook.get_summary()) # This will call the OVERRIDDEN method in EBook
-my_ebook.open_book()
-my_ebook.read_page(150)
-my_ebook.send_to_device("Kindle Oasis") # This method only exists in the EBook class
-my_ebook.check_drm_status() # Demonstrates encapsulation
\ No newline at end of file
+    # Use methods from both the parent and child classes
+    print(my_ebook.get_summary()) # This will call the OVERRIDDEN method in EBook
+    my_ebook.open_book()
+    my_ebook.read_page(150)
+    my_ebook.send_to_device("Kindle Oasis") # This method only exists in the EBook class
+    my_ebook.check_drm_status() # Demonstrates encapsulation
\ No newline at end of file
@@ -0,0 +1,246 @@
+# Assignment 1 (extended): A compact catalog for millions of books 📚
+
+from array import array
+
+from book import Book, EBook
+
+
+# --- Step 1: Bit flags packed into one byte per book ---
+IS_EBOOK = 0b001
+IS_OPEN = 0b010
+IS_DRM_PROTECTED = 0b100
+IS_REMOVED = 0b1000
+
+
+class StringPool:
+    """
+    Stores every distinct string once and hands out small integer ids,
+    so a genre or format repeated a million times costs one id per book.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        """Returns the id of value, adding it to the pool the first time it is seen."""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self.ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+    def __getitem__(self, string_id):
+        return self.values[string_id]
+
+
+# --- Step 2: Lightweight views that behave like Book / EBook ---
+class BookView:
+    """
+    A Book-like handle onto one row of a Catalog.
+    It only holds the catalog and a row number (thanks to __slots__ it has no
+    __dict__), and reads every attribute from the catalog's columns, so it
+    reuses Book's methods unchanged.
+    """
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog, row):
+        self._catalog = catalog
+        self._row = row
+
+    # Attribute access goes straight to the columns
+    title = property(lambda self: self._catalog.titles[self._row])
+    author = property(lambda self: self._catalog.authors[self._catalog.author_ids[self._row]])
+    pages = property(lambda self: self._catalog.pages[self._row])
+    genre = property(lambda self: self._catalog.genres[self._catalog.genre_ids[self._row]])
+
+    @property
+    def is_open(self):
+        return bool(self._catalog.flags[self._row] & IS_OPEN)
+
+    @is_open.setter
+    def is_open(self, value):
+        if value:
+            self._catalog.flags[self._row] |= IS_OPEN
+        else:
+            self._catalog.flags[self._row] &= ~IS_OPEN & 0xFF
+
+    @property
+    def current_page(self):
+        return self._catalog.current_pages[self._row]
+
+    @current_page.setter
+    def current_page(self, value):
+        self._catalog.current_pages[self._row] = value
+
+    # The behaviour is exactly Book's: these functions only use the attributes above
+    open_book = Book.open_book
+    close_book = Book.close_book
+    read_page = Book.read_page
+    get_summary = Book.get_summary
+
+    def __repr__(self):
+        return f"<{type(self).__name__} #{self._row}: {self.title!r}>"
+
+
+class EBookView(BookView):
+    """An EBook-like handle onto one row of a Catalog."""
+    __slots__ = ()
+
+    file_format = property(lambda self: self._catalog.formats[self._catalog.format_ids[self._row]])
+    # Sizes are stored as float32, so round away the noise (5.2 would otherwise read back as 5.19999980...)
+    file_size_mb = property(lambda self: round(self._catalog.file_sizes[self._row], 6))
+    _is_drm_protected = property(lambda self: bool(self._catalog.flags[self._row] & IS_DRM_PROTECTED))
+
+    send_to_device = EBook.send_to_device
+    check_drm_status = EBook.check_drm_status
+
+    def get_summary(self):
+        """Same output as EBook.get_summary (Book's summary plus the digital details)."""
+        return f"{BookView.get_summary(self)}, Format: {self.file_format}, Size: {self.file_size_mb}MB"
+
+
+# --- Step 3: The catalog itself, stored column by column ---
+class Catalog:
+    """
+    Stores books in parallel compact arrays instead of one object per book:
+    interned author/genre/format ids, integer page counts, float32 file sizes
+    and one byte of bit flags per book. Indexing returns a BookView or EBookView.
+    A book's row number never changes: removing a book only marks its row.
+    """
+
+    def __init__(self):
+        self.titles = []
+        self.authors = StringPool()
+        self.genres = StringPool()
+        self.formats = StringPool()
+        self.author_ids = array('I')
+        self.genre_ids = array('H')
+        self.format_ids = array('H')
+        self.pages = array('I')
+        self.current_pages = array('I')
+        self.file_sizes = array('f')
+        self.flags = bytearray()
+        self.removed_count = 0
+
+    def __len__(self):
+        return len(self.titles) - self.removed_count
+
+    def __getitem__(self, row):
+        if not -len(self.titles) <= row < len(self.titles):
+            raise IndexError("catalog index out of range")
+        row %= len(self.titles)
+        if self.flags[row] & IS_REMOVED:
+            raise IndexError(f"book {row} was removed from the catalog")
+        view_class = EBookView if self.flags[row] & IS_EBOOK else BookView
+        return view_class(self, row)
+
+    def __iter__(self):
+        for row in range(len(self.titles)):
+            if not self.flags[row] & IS_REMOVED:
+                yield self[row]
+
+    def is_removed(self, row):
+        return bool(self.flags[row] & IS_REMOVED)
+
+    def add_book(self, title, author, pages, genre):
+        """Adds a physical book and returns its row number."""
+        return self._append(title, author, pages, genre, None, 0.0, 0)
+
+    def add_ebook(self, title, author, pages, genre, file_format, file_size_mb, drm_protected=True):
+        """Adds an ebook (DRM protected by default, like EBook) and returns its row number."""
+        flags = IS_EBOOK | (IS_DRM_PROTECTED if drm_protected else 0)
+        return self._append(title, author, pages, genre, file_format, file_size_mb, flags)
+
+    def add(self, book):
+        """Adds an existing Book or EBook object, copying its current state."""
+        if isinstance(book, EBook):
+            row = self.add_ebook(book.title, book.author, book.pages, book.genre,
+                                 book.file_format, book.file_size_mb, book._is_drm_protected)
+        else:
+            row = self.add_book(book.title, book.author, book.pages, book.genre)
+        if book.is_open:
+            self.flags[row] |= IS_OPEN
+        self.current_pages[row] = book.current_page
+        return row
+
+    def remove(self, row):
+        """Removes the book at row. The row number is not reused."""
+        if self.flags[row] & IS_REMOVED:
+            raise KeyError(f"book {row} was already removed")
+        self.flags[row] |= IS_REMOVED
+        self.removed_count += 1
+
+    def _append(self, title, author, pages, genre, file_format, file_size_mb, flags):
+        self.titles.append(title)
+        self.author_ids.append(self.authors.intern(author))
+        self.genre_ids.append(self.genres.intern(genre))
+        self.format_ids.append(self.formats.intern(file_format))
+        self.pages.append(pages)
+        self.current_pages.append(1)
+        self.file_sizes.append(file_size_mb)
+        self.flags.append(flags)
+        return len(self.titles) - 1
+
+
+# --- Step 4: How much memory does each approach need per book? ---
+def memory_report(count=100_000):
+    """
+    Builds `count` books as Book/EBook objects and as a Catalog, and prints
+    the bytes allocated per book by each. Titles are unique per book in both
+    cases; authors, genres and formats come from small shared sets.
+    """
+    import tracemalloc
+
+    authors = [f"Author {i}" for i in range(1000)]
+    genres = ["Fantasy", "Sci-Fi", "Mystery", "Romance", "History"]
+    formats = ["EPUB", "PDF", "MOBI"]
+    titles = [f"Title {i}" for i in range(count)]
+
+    def build_objects():
+        return [
+            EBook(titles[i], authors[i % 1000], 100 + i % 900, genres[i % 5], formats[i % 3], 1.5)
+            if i % 2 else Book(titles[i], authors[i % 1000], 100 + i % 900, genres[i % 5])
+            for i in range(count)
+        ]
+
+    def build_catalog():
+        catalog = Catalog()
+        for i in range(count):
+            if i % 2:
+                catalog.add_ebook(titles[i], authors[i % 1000], 100 + i % 900, genres[i % 5], formats[i % 3], 1.5)
+            else:
+                catalog.add_book(titles[i], authors[i % 1000], 100 + i % 900, genres[i % 5])
+        return catalog
+
+    results = {}
+    for label, build in (("Book/EBook objects", build_objects), ("Catalog", build_catalog)):
+        tracemalloc.start()
+        built = build()
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = allocated / count
+        print(f"{label:<20} {allocated / count:>8.1f} bytes per book")
+        del built
+    return results
+
+
+if __name__ == "__main__":
+    print("--- Building a compact catalog ---")
+    catalog = Catalog()
+    catalog.add(Book("The Hobbit", "J.R.R. Tolkien", 310, "Fantasy"))
+    catalog.add_ebook("Dune", "Frank Herbert", 412, "Sci-Fi", "EPUB", 5.2)
+
+    # The views keep the familiar Book / EBook API
+    for book in catalog:
+        print(book.get_summary())
+    dune = catalog[1]
+    dune.open_book()
+    dune.read_page(150)
+    dune.send_to_device("Kindle Oasis")
+    dune.check_drm_status()
+
+    print("\n" + "="*40 + "\n")
+    print("--- Memory per book ---")
+    memory_report()
@@ -0,0 +1,274 @@
+# Assignment 1 (extended): Finding books fast with indexes 🔎
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from catalog import IS_EBOOK, IS_REMOVED, Catalog
+
+# Buffered rows up to this many are inserted one by one instead of merged as a batch
+INSERT_IN_PLACE_ROWS = 32
+
+
+class CatalogIndex:
+    """
+    Keeps lookup indexes over a Catalog so queries never scan every book:
+    - author and genre: hash indexes (dict of name -> set of rows)
+    - pages: the rows sorted by page count, for range queries
+    - title: the rows sorted by lowercase title, for prefix queries
+
+    Add and remove books through the index (not the catalog directly) so the
+    indexes stay up to date. New rows go into the hash indexes at once, but
+    are only buffered for the sorted indexes: the next query sorts the whole
+    buffer once and merges it in, so adding n books costs O(n log n) instead
+    of one O(n) array insert per book.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog if catalog is not None else Catalog()
+        self.by_author = {}
+        self.by_genre = {}
+
+        # Sorted indexes are two parallel sequences: the sort keys and the row of each key
+        self.page_keys = array('I')
+        self.page_rows = array('I')
+        self.title_keys = []
+        self.title_rows = array('I')
+        # Rows not yet merged into the sorted indexes; the existing books are sorted in one go too
+        self.pending_rows = [row for row in range(len(self.catalog.titles)) if not self.catalog.is_removed(row)]
+        for row in self.pending_rows:
+            self._add_to_hash_indexes(row)
+
+    # --- Keeping the indexes up to date ---
+    def add_book(self, title, author, pages, genre):
+        return self._index_row(self.catalog.add_book(title, author, pages, genre))
+
+    def add_ebook(self, title, author, pages, genre, file_format, file_size_mb, drm_protected=True):
+        return self._index_row(self.catalog.add_ebook(
+            title, author, pages, genre, file_format, file_size_mb, drm_protected))
+
+    def add(self, book):
+        """Adds an existing Book or EBook object."""
+        return self._index_row(self.catalog.add(book))
+
+    def remove(self, row):
+        """Removes the book at row from the catalog and from every index."""
+        self._merge_pending()
+        catalog = self.catalog
+        catalog.remove(row)
+        self.by_author[catalog.authors[catalog.author_ids[row]]].discard(row)
+        self.by_genre[catalog.genres[catalog.genre_ids[row]]].discard(row)
+        self._remove_sorted(self.page_keys, self.page_rows, catalog.pages[row], row)
+        self._remove_sorted(self.title_keys, self.title_rows, catalog.titles[row].lower(), row)
+
+    def _index_row(self, row):
+        self._add_to_hash_indexes(row)
+        self.pending_rows.append(row)
+        return row
+
+    def _merge_pending(self):
+        """Sorts the buffered rows once and merges them into both sorted indexes."""
+        if not self.pending_rows:
+            return
+        catalog = self.catalog
+        pending, self.pending_rows = self.pending_rows, []
+        # sorted() is stable and the buffered rows are in row order, so ties stay in row order
+        by_pages = sorted(pending, key=catalog.pages.__getitem__)
+        self.page_keys, self.page_rows = self._merge_sorted(
+            self.page_keys, self.page_rows, array('I', (catalog.pages[row] for row in by_pages)), array('I', by_pages))
+        titles = [catalog.titles[row].lower() for row in pending]
+        order = sorted(range(len(pending)), key=titles.__getitem__)
+        self.title_keys, self.title_rows = self._merge_sorted(
+            self.title_keys, self.title_rows, [titles[i] for i in order], array('I', (pending[i] for i in order)))
+
+    @staticmethod
+    def _merge_sorted(keys, rows, new_keys, new_rows):
+        """
+        Merges sorted new keys/rows into sorted keys/rows and returns the merged pair.
+        Each new key is placed with a binary search and the old entries between
+        two new ones are copied as one slice, so a small batch costs little more
+        than copying the arrays once.
+        """
+        if not keys:
+            return new_keys, new_rows
+        if len(new_keys) <= INSERT_IN_PLACE_ROWS:
+            # A handful of rows (e.g. one add between two queries) is cheaper to insert directly
+            for key, row in zip(new_keys, new_rows):
+                position = bisect_right(keys, key)
+                keys.insert(position, key)
+                rows.insert(position, row)
+            return keys, rows
+        merged_keys, merged_rows = keys[:0], rows[:0]
+        previous = 0
+        for key, row in zip(new_keys, new_rows):
+            # New rows come after every existing row, so they go after equal keys
+            position = bisect_right(keys, key, previous)
+            merged_keys += keys[previous:position]
+            merged_rows += rows[previous:position]
+            merged_keys.append(key)
+            merged_rows.append(row)
+            previous = position
+        merged_keys += keys[previous:]
+        merged_rows += rows[previous:]
+        return merged_keys, merged_rows
+
+    def _add_to_hash_indexes(self, row):
+        catalog = self.catalog
+        self.by_author.setdefault(catalog.authors[catalog.author_ids[row]], set()).add(row)
+        self.by_genre.setdefault(catalog.genres[catalog.genre_ids[row]], set()).add(row)
+
+    @staticmethod
+    def _remove_sorted(keys, rows, key, row):
+        start, end = bisect_left(keys, key), bisect_right(keys, key)
+        position = start + rows[start:end].index(row)
+        del keys[position]
+        del rows[position]
+
+    # --- Queries ---
+    def _page_range(self, min_pages, max_pages):
+        start = 0 if min_pages is None else bisect_left(self.page_keys, min_pages)
+        end = len(self.page_keys) if max_pages is None else bisect_right(self.page_keys, max_pages)
+        return start, max(start, end)
+
+    def _title_range(self, prefix):
+        # Every title starting with prefix sorts between prefix and prefix + the highest character
+        return bisect_left(self.title_keys, prefix), bisect_right(self.title_keys, prefix + '\U0010ffff')
+
+    def find(self, author=None, genre=None, title_prefix=None, min_pages=None, max_pages=None, ebook=None):
+        """
+        Returns the sorted rows of the books matching every given condition.
+
+        Each index can tell how many books match its own condition without
+        building the list, so the query starts from the smallest candidate
+        list, intersects it with the author/genre sets and checks the other
+        conditions row by row on the catalog columns.
+        """
+        self._merge_pending()
+        catalog = self.catalog
+        prefix = title_prefix.lower() if title_prefix is not None else None
+
+        # --- Step 1: Pick the smallest candidate list ---
+        candidates = []   # (size, function returning the rows)
+        hash_sets = []
+        for name, index in ((author, self.by_author), (genre, self.by_genre)):
+            if name is not None:
+                hash_set = index.get(name, set())
+                hash_sets.append(hash_set)
+                candidates.append((len(hash_set), lambda hash_set=hash_set: hash_set))
+        if prefix is not None:
+            title_start, title_end = self._title_range(prefix)
+            candidates.append((title_end - title_start, lambda: self.title_rows[title_start:title_end]))
+        if min_pages is not None or max_pages is not None:
+            page_start, page_end = self._page_range(min_pages, max_pages)
+            candidates.append((page_end - page_start, lambda: self.page_rows[page_start:page_end]))
+        if not candidates:
+            rows = range(len(catalog.titles))
+        else:
+            size, get_rows = min(candidates, key=lambda candidate: candidate[0])
+            if size == 0:
+                return []
+            rows = get_rows()
+            # Set intersections run in C, so narrow the candidates with the hash indexes first
+            for hash_set in sorted(hash_sets, key=len):
+                if hash_set is not rows:
+                    rows = hash_set.intersection(rows)
+
+        # --- Step 2: Check the remaining conditions against the columns ---
+        low = min_pages if min_pages is not None else 0
+        high = max_pages if max_pages is not None else float('inf')
+        result = []
+        for row in rows:
+            flags = catalog.flags[row]
+            if flags & IS_REMOVED:
+                continue
+            if not low <= catalog.pages[row] <= high:
+                continue
+            if ebook is not None and bool(flags & IS_EBOOK) != ebook:
+                continue
+            if prefix is not None and not catalog.titles[row].lower().startswith(prefix):
+                continue
+            result.append(row)
+        result.sort()
+        return result
+
+    def find_books(self, **conditions):
+        """Like find(), but returns BookView/EBookView objects."""
+        return [self.catalog[row] for row in self.find(**conditions)]
+
+
+# --- Linear scan, for comparison ---
+def scan_books(books, author=None, genre=None, title_prefix=None, min_pages=None, max_pages=None, ebook=None):
+    """Finds matching books by checking every one of them, the way book.py would have to."""
+    from book import EBook
+
+    prefix = title_prefix.lower() if title_prefix is not None else None
+    return [
+        book for book in books
+        if (author is None or book.author == author)
+        and (genre is None or book.genre == genre)
+        and (prefix is None or book.title.lower().startswith(prefix))
+        and (min_pages is None or book.pages >= min_pages)
+        and (max_pages is None or book.pages <= max_pages)
+        and (ebook is None or isinstance(book, EBook) == ebook)
+    ]
+
+
+def benchmark(count=1_000_000, repeat=5):
+    """
+    Builds `count` books both as Book/EBook objects and as an indexed catalog,
+    then times some queries with the indexes and with a linear scan.
+    """
+    import random
+    import time
+
+    from book import Book, EBook
+
+    rng = random.Random(0)
+    authors = [f"Author {i}" for i in range(10_000)]
+    genres = ["Fantasy", "Sci-Fi", "Mystery", "Romance", "History", "Poetry"]
+    words = ["Dune", "Night", "River", "Empire", "Garden", "Storm", "Glass", "Winter"]
+
+    print(f"Building {count:,} books...")
+    books = []
+    index = CatalogIndex()
+    for i in range(count):
+        title = f"{rng.choice(words)} {rng.choice(words)} {i}"
+        author, genre, pages = rng.choice(authors), rng.choice(genres), rng.randint(50, 1200)
+        if i % 1000 == 1:
+            author = "Frank Herbert"
+        if i % 2:
+            books.append(EBook(title, author, pages, genre, "EPUB", 2.5))
+            index.add_ebook(title, author, pages, genre, "EPUB", 2.5)
+        else:
+            books.append(Book(title, author, pages, genre))
+            index.add_book(title, author, pages, genre)
+
+    queries = [
+        ("Sci-Fi EBooks by Herbert over 300 pages",
+         dict(author="Frank Herbert", genre="Sci-Fi", min_pages=301, ebook=True)),
+        ("titles starting 'Dune Storm 12'", dict(title_prefix="Dune Storm 12")),
+        ("Poetry between 1000 and 1010 pages", dict(genre="Poetry", min_pages=1000, max_pages=1010)),
+    ]
+
+    def best_time(run):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = run()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000, len(hits)
+
+    print(f"{'query':<42} {'index ms':>9} {'scan ms':>9} {'hits':>6}")
+    results = {}
+    for label, conditions in queries:
+        indexed_ms, hits = best_time(lambda: index.find(**conditions))
+        scan_ms, scan_hits = best_time(lambda: scan_books(books, **conditions))
+        assert hits == scan_hits, "index and scan disagree"
+        results[label] = (indexed_ms, scan_ms, hits)
+        print(f"{label:<42} {indexed_ms:>9.3f} {scan_ms:>9.1f} {hits:>6}")
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
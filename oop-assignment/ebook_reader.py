@@ -0,0 +1,304 @@
+# Assignment 1 (extended): Serving real pages for our EBooks 📖
+
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from book import EBook
+
+
+LINES_PER_PAGE = 40
+CACHE_PAGES = 64
+PREFETCH_PAGES = 4
+INDEX_VERSION = 2
+
+# A page ends at a form feed, or after LINES_PER_PAGE newlines
+PAGE_BREAK = re.compile(rb'[\n\f]')
+
+
+# --- Step 1: The page-offset index, built once per file ---
+def build_page_offsets(data, lines_per_page=LINES_PER_PAGE):
+    """
+    Returns an array with the byte offset where every page starts, followed by
+    the total size, so page n (1-based) is data[offsets[n - 1]:offsets[n]].
+    `data` can be bytes or an mmap; the encoding must be ASCII compatible (e.g. UTF-8).
+    """
+    offsets = array('Q', [0])
+    lines = 0
+    for match in PAGE_BREAK.finditer(data):
+        if match.group() == b'\f':
+            if lines == 0:
+                # The page already ended at LINES_PER_PAGE newlines (or the file starts with a
+                # form feed): keep the form feed on that page instead of starting an empty one
+                if len(offsets) > 1:
+                    offsets[-1] = match.end()
+                continue
+            lines = lines_per_page
+        else:
+            lines += 1
+        if lines == lines_per_page:
+            offsets.append(match.end())
+            lines = 0
+    # The text after the last break is one more page; no page at all if nothing follows it
+    if offsets[-1] < len(data):
+        offsets.append(len(data))
+    elif len(offsets) == 1:
+        offsets = array('Q')
+    return offsets
+
+
+def index_path_for(text_path):
+    return f"{text_path}.pageidx"
+
+
+def load_or_build_offsets(text_path, data, lines_per_page=LINES_PER_PAGE):
+    """
+    Loads the persisted page index of text_path, or builds and saves it if it
+    is missing or the file changed since (different size or modification time).
+    Returns (offsets, True if the index was rebuilt).
+
+    The index file is one line of JSON describing it, followed by the raw
+    offsets, so loading it never runs code from the file (unlike pickle).
+    """
+    stat = os.stat(text_path)
+    header = {
+        'version': INDEX_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'lines_per_page': lines_per_page,
+    }
+    index_path = index_path_for(text_path)
+    try:
+        with open(index_path, 'rb') as f:
+            saved = json.loads(f.readline())
+            if {key: saved.get(key) for key in header} == header:
+                offsets = array('Q')
+                offsets.fromfile(f, saved['count'])
+                if saved['byteorder'] != sys.byteorder:
+                    offsets.byteswap()
+                return offsets, False
+    except (OSError, ValueError, EOFError, KeyError, TypeError, AttributeError):
+        pass
+
+    offsets = build_page_offsets(data, lines_per_page)
+    # Write to a temporary file first so a crash never leaves a half-written index.
+    # Every writer gets its own temporary name, so readers opening the same book
+    # at the same time cannot overwrite each other's partial file.
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            header.update(count=len(offsets), byteorder=sys.byteorder)
+            f.write(json.dumps(header).encode() + b'\n')
+            offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+        tmp_path = None
+    except OSError:
+        # A read-only location only means the index is rebuilt next time
+        pass
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return offsets, True
+
+
+# --- Step 2: A page store with an LRU cache and prefetching ---
+class PageStore:
+    """
+    Serves the pages of a large text file without reading the whole file.
+
+    The file is memory-mapped and its page-offset index is persisted next to
+    it, so fetching any page is one slice of the map. Decoded pages are kept
+    in an LRU cache, and after every page turn the next few pages are decoded
+    in a background thread so the reader rarely waits.
+    """
+
+    def __init__(self, text_path, lines_per_page=LINES_PER_PAGE, cache_pages=CACHE_PAGES,
+                 prefetch=PREFETCH_PAGES, encoding='utf-8'):
+        self.text_path = text_path
+        self.encoding = encoding
+        self.cache_pages = cache_pages
+        self.prefetch = prefetch
+        self._file = open(text_path, 'rb')
+        # mmap cannot map an empty file
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.offsets, self.index_rebuilt = load_or_build_offsets(text_path, self._data, lines_per_page)
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetcher = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def page_count(self):
+        return max(0, len(self.offsets) - 1)
+
+    def _decode(self, page_number):
+        start, end = self.offsets[page_number - 1], self.offsets[page_number]
+        return self._data[start:end].decode(self.encoding, errors='replace').strip('\f')
+
+    def _remember(self, page_number, text):
+        with self._lock:
+            self._cache[page_number] = text
+            self._cache.move_to_end(page_number)
+            while len(self._cache) > self.cache_pages:
+                self._cache.popitem(last=False)
+
+    def get_page(self, page_number):
+        """Returns the text of page page_number (1-based)."""
+        if not 1 <= page_number <= self.page_count:
+            raise IndexError(f"page {page_number} is out of range (1-{self.page_count})")
+        upcoming = range(page_number + 1, min(self.page_count, page_number + self.prefetch) + 1)
+        with self._lock:
+            text = self._cache.get(page_number)
+            if text is not None:
+                self._cache.move_to_end(page_number)
+                self.hits += 1
+            else:
+                self.misses += 1
+            # Handing work to the thread costs more than a cache hit, so the whole window
+            # is refilled only once the reader is about to run out of prefetched pages
+            needs_prefetch = bool(upcoming) and upcoming[0] not in self._cache
+        if text is None:
+            text = self._decode(page_number)
+            self._remember(page_number, text)
+        if needs_prefetch and self._prefetcher is not None:
+            self._prefetcher.submit(self._prefetch, upcoming)
+        return text
+
+    def _prefetch(self, page_numbers):
+        for next_page in page_numbers:
+            with self._lock:
+                if next_page in self._cache:
+                    continue
+            self._remember(next_page, self._decode(next_page))
+
+    def cache_info(self):
+        with self._lock:
+            size = len(self._cache)
+        return {'hits': self.hits, 'misses': self.misses, 'size': size, 'max_size': self.cache_pages}
+
+    def close(self):
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown(wait=True)
+            self._prefetcher = None
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Step 3: An EBook whose pages have real content ---
+class ReadableEBook(EBook):
+    """
+    An EBook backed by a text file. The page count comes from the file, and
+    read_page() returns the text of the page as well as moving to it.
+    """
+
+    def __init__(self, title, author, genre, text_path, file_format="TXT", **store_options):
+        self.store = PageStore(text_path, **store_options)
+        file_size_mb = round(os.path.getsize(text_path) / (1024 * 1024), 2)
+        super().__init__(title, author, self.store.page_count, genre, file_format, file_size_mb)
+
+    def read_page(self, page_number):
+        """Moves to the page like EBook.read_page and returns its text (None if the move failed)."""
+        super().read_page(page_number)
+        if not self.is_open or self.current_page != page_number:
+            return None
+        return self.store.get_page(page_number)
+
+    def close(self):
+        """Releases the memory map and the prefetch thread."""
+        self.store.close()
+
+
+# --- Step 4: How fast are page turns? ---
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def benchmark(size_mb=200, turns=2000, work_dir=None):
+    """
+    Writes a `size_mb` MB book, then times building and reloading its page
+    index, random page jumps, sequential page turns, and (for comparison) finding
+    a page by reading the file from the start.
+    """
+    import random
+    import time
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        text_path = os.path.join(tmp, 'book.txt')
+        line = "It was a dark and stormy night; the rain fell in torrents, except at occasional intervals.\n"
+        with open(text_path, 'w', encoding='utf-8') as f:
+            for _ in range(size_mb * 1024 * 1024 // len(line)):
+                f.write(line)
+
+        start = time.perf_counter()
+        PageStore(text_path, prefetch=0).close()
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        store = PageStore(text_path)
+        load_seconds = time.perf_counter() - start
+        print(f"{size_mb} MB, {store.page_count:,} pages: index built in {build_seconds:.2f}s, "
+              f"reloaded in {load_seconds * 1000:.1f} ms")
+
+        def time_pages(page_numbers, pause):
+            timings = []
+            for page_number in page_numbers:
+                begin = time.perf_counter()
+                store.get_page(page_number)
+                timings.append((time.perf_counter() - begin) * 1e6)
+                # A reader spends a moment on each page, which is when the prefetcher works
+                time.sleep(pause)
+            timings.sort()
+            return _percentile(timings, 0.5), _percentile(timings, 0.99)
+
+        rng = random.Random(0)
+        random_pages = [rng.randint(1, store.page_count) for _ in range(turns)]
+        first = rng.randint(1, max(1, store.page_count - turns))
+        sequential_pages = range(first, min(store.page_count, first + turns) + 1)
+
+        print(f"{'access':<22} {'p50 us':>9} {'p99 us':>9}")
+        for label, pages in (("random jumps", random_pages), ("sequential turns", sequential_pages)):
+            p50, p99 = time_pages(pages, pause=0.001)
+            print(f"{label:<22} {p50:>9.1f} {p99:>9.1f}")
+
+        def read_from_start(page_number):
+            with open(text_path, encoding='utf-8') as f:
+                for line_number, text in enumerate(f):
+                    if line_number == (page_number - 1) * LINES_PER_PAGE:
+                        return text
+
+        begin = time.perf_counter()
+        for page_number in random_pages[:20]:
+            read_from_start(page_number)
+        print(f"{'scan from start (avg)':<22} {(time.perf_counter() - begin) / 20 * 1e6:>9.0f}")
+        print(f"cache: {store.cache_info()}")
+        store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] != '--benchmark':
+        # python ebook_reader.py book.txt 12
+        book = ReadableEBook(os.path.basename(sys.argv[1]), "Unknown", "Unknown", sys.argv[1])
+        print(book.get_summary())
+        book.open_book()
+        print(book.read_page(int(sys.argv[2]) if len(sys.argv) > 2 else 1))
+        book.close()
+    else:
+        # python ebook_reader.py --benchmark 200
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 200)
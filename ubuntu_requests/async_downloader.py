@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:
+    # The asyncio engine is optional; the synchronous downloader works without it.
+    aiohttp = None
+
+from image_downloader import (
+    DOWNLOAD_DIR,
+    Manifest,
+    discard_partial,
+    download_batch,
+    hash_file,
+    prepare_manifest_request,
+    read_url_list,
+    remember_validator,
+    store_download,
+)
+
+
+# --- asyncio Download Engine ---
+# Principle: Practicality - Keeping tens of thousands of fetches in flight on one thread.
+# Bigger chunks than the threaded downloader: every write goes through a worker thread.
+ASYNC_CHUNK_SIZE = 64 * 1024
+
+
+def _append_chunk(file, chunk, digest):
+    """Writes one chunk and adds it to the running hash (runs in a worker thread)."""
+    file.write(chunk)
+    digest.update(chunk)
+
+
+async def fetch_async(session, image_url, download_dir, manifest, semaphore, host_limits):
+    """
+    Downloads one URL with the same manifest rules as the threaded downloader:
+    conditional requests for URLs fetched before, Range resume of partial
+    downloads, and SHA-256 dedup with collision-free names.
+    The body is streamed to disk chunk by chunk, and all file work runs in
+    worker threads so it never blocks the event loop. A cancelled download
+    keeps its partial file, so the next run resumes it.
+    Returns a result dict like the batch downloader.
+    """
+    host = urlparse(image_url).netloc
+    # Wait for a free slot (overall and for this host) before starting the clock,
+    # so a long queue is neither reported as latency nor counted by a timeout
+    async with semaphore, host_limits[host]:
+        start = time.perf_counter()
+        try:
+            headers, entry, partial_path, _ = await asyncio.to_thread(
+                prepare_manifest_request, image_url, download_dir, manifest)
+            response = await session.get(image_url, headers=headers)
+            if response.status == 416 and 'Range' in headers:
+                # The partial file no longer fits the resource: drop it and fetch the whole image now
+                response.release()
+                await asyncio.to_thread(discard_partial, partial_path)
+                headers = {name: value for name, value in headers.items() if name not in ('Range', 'If-Range')}
+                response = await session.get(image_url, headers=headers)
+
+            async with response:
+                if response.status == 304:
+                    return {'url': image_url, 'ok': True, 'status': 'unchanged', 'bytes': 0,
+                            'seconds': time.perf_counter() - start, 'path': entry['path']}
+                response.raise_for_status()
+                await asyncio.to_thread(remember_validator, partial_path, response.headers)
+
+                digest = hashlib.sha256()
+                if response.status == 206:
+                    await asyncio.to_thread(hash_file, partial_path, digest)
+                    mode, status = 'ab', 'resumed'
+                else:
+                    mode, status = 'wb', 'downloaded'
+                written = 0
+                file = await asyncio.to_thread(open, partial_path, mode)
+                try:
+                    async for chunk in response.content.iter_chunked(ASYNC_CHUNK_SIZE):
+                        await asyncio.to_thread(_append_chunk, file, chunk, digest)
+                        written += len(chunk)
+                finally:
+                    await asyncio.to_thread(file.close)
+
+                status, save_path = await asyncio.to_thread(
+                    store_download, image_url, response, download_dir, manifest,
+                    partial_path, digest.hexdigest(), status)
+            return {'url': image_url, 'ok': True, 'status': status, 'bytes': written,
+                    'seconds': time.perf_counter() - start, 'path': save_path}
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            return {'url': image_url, 'ok': False, 'status': 'failed', 'bytes': 0,
+                    'seconds': time.perf_counter() - start, 'error': str(e) or type(e).__name__}
+
+
+async def download_many_async(urls, download_dir=DOWNLOAD_DIR, concurrency=1000, per_host=100, timeout=30):
+    """
+    Downloads every URL with at most `concurrency` requests in flight overall
+    and `per_host` connections to any single host, recording them in the
+    download folder's manifest.
+    `timeout` limits connecting and each wait for data, not the whole download,
+    so large images and long queues do not time out.
+    A URL listed more than once is downloaded once, and the results follow
+    the order of the first occurrences.
+    Cancelling the returned coroutine cancels all in-flight downloads.
+    """
+    if aiohttp is None:
+        raise RuntimeError("The asyncio engine needs aiohttp: pip install aiohttp")
+
+    # Every copy of a URL would write to the same partial file, so each URL is fetched once
+    urls = list(dict.fromkeys(urls))
+
+    os.makedirs(download_dir, exist_ok=True)
+    manifest = Manifest(download_dir)
+    semaphore = asyncio.Semaphore(concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            tasks = [
+                asyncio.create_task(fetch_async(session, url, download_dir, manifest, semaphore, host_limits))
+                for url in urls
+            ]
+            try:
+                return await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                # Let every task close its partial file before we return
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+    finally:
+        # Whatever finished is remembered, even if the batch was cancelled
+        await asyncio.to_thread(manifest.save)
+
+
+def download_batch_async(url_file, download_dir=DOWNLOAD_DIR, concurrency=1000, per_host=100):
+    """Synchronous wrapper: downloads every URL in url_file with the asyncio engine."""
+    listed = [url for url in read_url_list(url_file) if url.lower().startswith(('http://', 'https://'))]
+    urls = list(dict.fromkeys(listed))
+    if len(urls) < len(listed):
+        print(f"⚠️ Skipping {len(listed) - len(urls)} duplicate URLs")
+    print(f"--- 🌍 Downloading {len(urls)} images with up to {concurrency} in flight ---")
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(download_many_async(urls, download_dir, concurrency, per_host))
+    except KeyboardInterrupt:
+        print("\n🛑 Cancelled, unfinished downloads will resume on the next run.")
+        return None
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r['ok']]
+    total_mb = sum(r['bytes'] for r in succeeded) / (1024 * 1024)
+    statuses = defaultdict(int)
+    for r in succeeded:
+        statuses[r['status']] += 1
+    print(f"✅ {len(succeeded)} ok ({dict(statuses)}), ❌ {len(results) - len(succeeded)} failed, in {elapsed:.2f}s "
+          f"({total_mb / elapsed if elapsed else 0:.2f} MB/s)")
+    return results
+
+
+# --- Benchmark Against a Local Stand-in Server ---
+class _FakeImageHandler(BaseHTTPRequestHandler):
+    """
+    Serves a block of bytes as a JPEG for every path. The path is appended so
+    every image has different content and none are skipped as duplicates.
+    """
+    body = b''
+
+    def do_GET(self):
+        suffix = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.body) + len(suffix)))
+        self.end_headers()
+        self.wfile.write(self.body)
+        self.wfile.write(suffix)
+
+    def log_message(self, format, *args):
+        # Keep the benchmark output readable
+        pass
+
+
+def start_stand_in_server(image_bytes):
+    """Starts a local HTTP server in a background thread. Returns (server, base URL)."""
+    handler = type('Handler', (_FakeImageHandler,), {'body': b'\xff' * image_bytes})
+    # A deep listen backlog, so hundreds of simultaneous connects are not dropped
+    server_class = type('Server', (ThreadingHTTPServer,), {'request_queue_size': 1024})
+    server = server_class(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _measure(label, run):
+    """Runs a download function and prints its time, throughput and peak Python memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:>8.2f}s {peak / (1024 * 1024):>10.1f} MB peak")
+    return elapsed, peak
+
+
+def benchmark(count=2000, image_kb=256, workers=16, concurrency=500):
+    """
+    Downloads `count` fake images from a local server with the synchronous
+    thread-pool downloader and with the asyncio engine, and compares them.
+    """
+    server, base_url = start_stand_in_server(image_kb * 1024)
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            url_file = os.path.join(work_dir, 'urls.txt')
+            with open(url_file, 'w') as f:
+                f.writelines(f"{base_url}/image_{i}.jpg\n" for i in range(count))
+
+            print(f"Benchmark: {count} images x {image_kb} KB from {base_url}")
+            print(f"{'engine':<12} {'time':>9} {'memory':>15}")
+            _measure('threads', lambda: download_batch(
+                url_file, os.path.join(work_dir, 'sync'), max_workers=workers, per_host=workers))
+            _measure('asyncio', lambda: download_batch_async(
+                url_file, os.path.join(work_dir, 'async'), concurrency=concurrency, per_host=concurrency))
+    finally:
+        server.shutdown()
+
+
+# --- Main Execution Block ---
+#   python async_downloader.py urls.txt --concurrency 2000
+#   python async_downloader.py --benchmark
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="asyncio image downloader")
+    parser.add_argument('url_file', nargs='?')
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--per-host', type=int, default=100)
+    parser.add_argument('--benchmark', action='store_true', help="Compare with the threaded downloader on a local server")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(concurrency=args.concurrency)
+    elif args.url_file:
+        outcome = download_batch_async(args.url_file, concurrency=args.concurrency, per_host=args.per_host)
+        sys.exit(0 if outcome and all(r['ok'] for r in outcome) else 1)
+    else:
+        parser.error("a URL file or --benchmark is required")
@@ -1,8 +1,259 @@
 import requests
+import hashlib
+import json
 import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 import datetime
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CHUNK_SIZE = 8192
+DOWNLOAD_DIR = "Fetched_Images"
+MANIFEST_NAME = ".manifest.json"
+PARTIAL_DIR_NAME = ".partial"
+
+
+def resolve_filename(image_url, response, content_hash=None):
+    """
+    Works out a filename for a downloaded image: the last part of the URL path
+    if it looks like a filename, otherwise a generated name whose extension
+    comes from the 'Content-Type' header. The generated name uses the content
+    hash when it is known (so it never collides), and a timestamp otherwise.
+    """
+    # 1. Try to get the filename from the URL path.
+    parsed_url = urlparse(image_url)
+    filename = os.path.basename(parsed_url.path)
+
+    # 2. If the URL path doesn't give a good filename, generate one.
+    if not filename or '.' not in filename:
+        if content_hash:
+            unique_part = content_hash[:16]
+        else:
+            # Use a timestamp for a unique name.
+            unique_part = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Try to get the file extension from the 'Content-Type' header.
+        content_type = response.headers.get('content-type')
+        if content_type and 'image' in content_type:
+            # e.g., 'image/jpeg' -> 'jpeg'
+            extension = '.' + content_type.split('/')[-1].split(';')[0].strip()
+        else:
+            extension = '.jpg' # Default to .jpg if we can't determine it.
+        filename = f"downloaded_image_{unique_part}{extension}"
+    return filename
+
+
+def save_response(response, save_path, mode='wb', digest=None):
+    """
+    Streams a response body to disk in chunks and returns the number of bytes written.
+    If a hashlib digest is given, it is updated with every chunk as it is written.
+    """
+    written = 0
+    with open(save_path, mode) as file:
+        # Write the content in chunks to handle large images efficiently.
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            file.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            written += len(chunk)
+    return written
+
+
+# --- Download Manifest ---
+# Principle: Respect - Not downloading what we already have.
+class Manifest:
+    """
+    Remembers, for every URL fetched into a folder, its ETag, Last-Modified,
+    content hash and saved path. This lets re-runs send conditional requests,
+    skip unchanged images, resume partial downloads and store identical images only once.
+    """
+
+    def __init__(self, download_dir):
+        self.path = os.path.join(download_dir, MANIFEST_NAME)
+        # Re-entrant so a caller can hold it across several manifest calls
+        self.lock = threading.RLock()
+        self.entries = {}
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            # A missing or corrupt manifest just means everything is fetched again
+            self.entries = {}
+        self.paths_by_hash = {
+            entry['sha256']: entry['path'] for entry in self.entries.values() if entry.get('sha256')
+        }
+
+    def get(self, url):
+        with self.lock:
+            return self.entries.get(url)
+
+    def existing_path_for_hash(self, content_hash):
+        """Returns the path of an already saved file with this content, if it still exists."""
+        with self.lock:
+            path = self.paths_by_hash.get(content_hash)
+        return path if path and os.path.exists(path) else None
+
+    def record(self, url, **entry):
+        with self.lock:
+            self.entries[url] = entry
+            if entry.get('sha256'):
+                self.paths_by_hash.setdefault(entry['sha256'], entry['path'])
+
+    def save(self):
+        """Writes the manifest atomically so an interrupted run never corrupts it."""
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def _partial_path(download_dir, image_url):
+    """Returns where the unfinished download of a URL is kept."""
+    url_hash = hashlib.sha1(image_url.encode()).hexdigest()
+    return os.path.join(download_dir, PARTIAL_DIR_NAME, f"{url_hash}.part")
+
+
+def _unique_save_path(download_dir, filename, content_hash):
+    """Returns a save path for filename, adding part of the hash if another file already uses the name."""
+    save_path = os.path.join(download_dir, filename)
+    if os.path.exists(save_path):
+        name, ext = os.path.splitext(filename)
+        save_path = os.path.join(download_dir, f"{name}_{content_hash[:8]}{ext}")
+    return save_path
+
+
+def prepare_manifest_request(image_url, download_dir, manifest):
+    """
+    Works out the request headers for a manifest-aware fetch: conditional
+    headers for a URL fetched before, and Range/If-Range to resume a partial
+    download. Returns (headers, manifest entry or None, partial file path, bytes already on disk).
+    """
+    entry = manifest.get(image_url)
+    headers = {}
+    if entry and os.path.exists(entry['path']):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    partial_path = _partial_path(download_dir, image_url)
+    os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+    partial_size = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+    partial_validator = None
+    if partial_size:
+        try:
+            with open(f"{partial_path}.validator", 'r') as f:
+                partial_validator = f.read().strip()
+        except OSError:
+            partial_validator = None
+    if partial_size and partial_validator:
+        headers['Range'] = f"bytes={partial_size}-"
+        # If-Range makes the server send the whole image if it changed since the partial download
+        headers['If-Range'] = partial_validator
+    return headers, entry, partial_path, partial_size
+
+
+def discard_partial(partial_path):
+    """Forgets a partial download the server no longer accepts (HTTP 416)."""
+    for path in (partial_path, f"{partial_path}.validator"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def remember_validator(partial_path, response_headers):
+    """Stores the ETag/Last-Modified of a download in progress, so it can be resumed safely."""
+    validator = response_headers.get('ETag') or response_headers.get('Last-Modified')
+    if validator:
+        with open(f"{partial_path}.validator", 'w') as f:
+            f.write(validator)
+
+
+def hash_file(path, digest):
+    """Feeds the contents of a file into a hashlib digest."""
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest
+
+
+def store_download(image_url, response, download_dir, manifest, partial_path, content_hash, status):
+    """
+    Moves a finished partial download into the download folder and records it
+    in the manifest. If a file with the same content is already saved, the
+    partial file is dropped instead and the status becomes 'duplicate'.
+    Returns (status, save path).
+    """
+    # Hold the manifest lock so two downloads of the same image cannot both save it
+    with manifest.lock:
+        existing = manifest.existing_path_for_hash(content_hash)
+        if existing:
+            os.remove(partial_path)
+            save_path = existing
+            status = 'duplicate'
+        else:
+            filename = resolve_filename(image_url, response, content_hash)
+            save_path = _unique_save_path(download_dir, filename, content_hash)
+            os.replace(partial_path, save_path)
+
+        manifest.record(
+            image_url,
+            path=save_path,
+            sha256=content_hash,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            size=os.path.getsize(save_path),
+        )
+    if os.path.exists(f"{partial_path}.validator"):
+        os.remove(f"{partial_path}.validator")
+    return status, save_path
+
+
+def fetch_with_manifest(session, image_url, download_dir, manifest, timeout=10):
+    """
+    Downloads one URL using the manifest to avoid repeated work:
+      - sends If-None-Match / If-Modified-Since for URLs fetched before ('unchanged' on 304),
+      - resumes an interrupted download with an HTTP Range request,
+      - reuses an existing file with the same SHA-256 instead of saving a copy ('duplicate').
+    Returns (status, path, bytes received). Raises requests/IO errors like requests.get.
+    """
+    headers, entry, partial_path, _ = prepare_manifest_request(image_url, download_dir, manifest)
+
+    response = session.get(image_url, stream=True, timeout=timeout, headers=headers)
+    if response.status_code == 416 and 'Range' in headers:
+        # Our partial file is no longer valid for this resource (e.g. it is already
+        # complete), so drop it and ask for the whole image right away
+        response.close()
+        discard_partial(partial_path)
+        headers = {name: value for name, value in headers.items() if name not in ('Range', 'If-Range')}
+        response = session.get(image_url, stream=True, timeout=timeout, headers=headers)
+
+    with response:
+        if response.status_code == 304:
+            return 'unchanged', entry['path'], 0
+        response.raise_for_status()
+        remember_validator(partial_path, response.headers)
+
+        digest = hashlib.sha256()
+        if response.status_code == 206:
+            # Hash the bytes we already have, then append the rest
+            hash_file(partial_path, digest)
+            received = save_response(response, partial_path, mode='ab', digest=digest)
+            status = 'resumed'
+        else:
+            received = save_response(response, partial_path, digest=digest)
+            status = 'downloaded'
+
+        status, save_path = store_download(
+            image_url, response, download_dir, manifest, partial_path, digest.hexdigest(), status)
+    return status, save_path, received
+
+
 def download_image():
     """
     A practical tool that prompts for a URL, downloads an image,
@@ -21,7 +272,7 @@ def download_image():
     # --- Directory Creation ---
     # Principle: Sharing - Organizing fetched images in a dedicated folder.
     # We define a directory to store our downloaded images.
-    download_dir = "Fetched_Images"
+    download_dir = DOWNLOAD_DIR
     try:
         # os.makedirs creates the directory.
         # exist_ok=True prevents an error if the directory already exists.
@@ -38,40 +289,21 @@ def download_image():
         
         # Use requests to get the image data. stream=True is crucial for large files.
         # timeout=10 prevents the script from hanging indefinitely.
-        response = requests.get(image_url, stream=True, timeout=10)
-        
+        # The manifest lets a re-run skip images that have not changed on the server.
         # Principle: Respect - Checking for HTTP errors without crashing.
-        # raise_for_status() will raise an HTTPError for bad responses (4xx or 5xx).
-        response.raise_for_status()
+        # HTTP errors (4xx or 5xx) are raised as requests.exceptions.HTTPError.
+        manifest = Manifest(download_dir)
+        with requests.Session() as session:
+            status, save_path, _ = fetch_with_manifest(session, image_url, download_dir, manifest)
+        manifest.save()
+
+        if status == 'unchanged':
+            print(f"⏭️ Image has not changed since the last download: {save_path}")
+            return
+        if status == 'duplicate':
+            print(f"♻️ Identical image already saved at: {save_path}")
+            return
 
-        # --- Determine the Filename ---
-        # 1. Try to get the filename from the URL path.
-        parsed_url = urlparse(image_url)
-        filename = os.path.basename(parsed_url.path)
-        
-        # 2. If the URL path doesn't give a good filename, generate one.
-        if not filename or '.' not in filename:
-            # Use a timestamp for a unique name.
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            # Try to get the file extension from the 'Content-Type' header.
-            content_type = response.headers.get('content-type')
-            if content_type and 'image' in content_type:
-                # e.g., 'image/jpeg' -> 'jpeg'
-                extension = '.' + content_type.split('/')[-1]
-            else:
-                extension = '.jpg' # Default to .jpg if we can't determine it.
-            filename = f"downloaded_image_{timestamp}{extension}"
-
-        # Construct the full path to save the file.
-        save_path = os.path.join(download_dir, filename)
-
-        # --- Save the Image in Binary Mode ---
-        print(f"📥 Downloading '{filename}'...")
-        with open(save_path, 'wb') as file:
-            # Write the content in chunks to handle large images efficiently.
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-        
         print(f"🎉 Success! Image saved to: {save_path}")
 
     # --- Comprehensive Error Handling ---
@@ -87,7 +319,152 @@ def download_image():
     except IOError as e:
         print(f"❌ File Error: Could not save the image to disk. Reason: {e}")
 
+
+# --- Batch Mode ---
+# Principle: Practicality - Fetching many images at once over shared connections.
+def create_session(pool_size=32, retries=3, backoff=0.5):
+    """
+    Creates a requests Session that reuses connections (keep-alive) and retries
+    failed requests with exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def read_url_list(url_file):
+    """Reads one URL per line, skipping blank lines and '#' comments."""
+    with open(url_file, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def fetch_one(session, image_url, download_dir, host_limits, manifest):
+    """
+    Downloads a single URL with the shared session while holding its host's slot.
+    Returns a result dict with the URL, status, bytes received and latency.
+    """
+    host = urlparse(image_url).netloc
+    with host_limits[host]:
+        # Timed from inside the slot, so waiting for a busy host is not counted as latency
+        start = time.perf_counter()
+        try:
+            status, save_path, received = fetch_with_manifest(session, image_url, download_dir, manifest)
+            return {'url': image_url, 'ok': True, 'status': status, 'bytes': received,
+                    'seconds': time.perf_counter() - start, 'path': save_path}
+        except (requests.exceptions.RequestException, IOError) as e:
+            return {'url': image_url, 'ok': False, 'status': 'failed', 'bytes': 0,
+                    'seconds': time.perf_counter() - start, 'error': str(e)}
+
+
+def summarize_results(results, elapsed):
+    """Prints the throughput and latency summary of a batch and returns it as a dict."""
+    succeeded = [r for r in results if r['ok']]
+    latencies = sorted(r['seconds'] for r in succeeded)
+    total_bytes = sum(r['bytes'] for r in succeeded)
+
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    summary = {
+        'total': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'images_per_sec': len(succeeded) / elapsed if elapsed > 0 else 0.0,
+        'mb_per_sec': total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        'p50_latency': percentile(50),
+        'p95_latency': percentile(95),
+    }
+    print("\n--- 📊 Batch Summary ---")
+    print(f"✅ {summary['succeeded']} downloaded, ❌ {summary['failed']} failed, in {elapsed:.2f}s")
+    print(f"📦 {total_bytes / (1024 * 1024):.2f} MB at {summary['mb_per_sec']:.2f} MB/s "
+          f"({summary['images_per_sec']:.1f} images/s)")
+    statuses = defaultdict(int)
+    for r in succeeded:
+        statuses[r['status']] += 1
+    summary['statuses'] = dict(statuses)
+    print("🗂️ " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+    print(f"⏱️ Latency p50 {summary['p50_latency'] * 1000:.0f} ms, p95 {summary['p95_latency'] * 1000:.0f} ms")
+    return summary
+
+
+def download_batch(url_file, download_dir=DOWNLOAD_DIR, max_workers=16, per_host=4, retries=3, backoff=0.5):
+    """
+    Downloads every URL listed in url_file concurrently over one pooled session,
+    allowing at most `per_host` simultaneous requests to any single host.
+    """
+    try:
+        urls = read_url_list(url_file)
+        os.makedirs(download_dir, exist_ok=True)
+    except OSError as e:
+        print(f"❌ Error: Could not prepare the batch. Reason: {e}")
+        return None
+
+    valid_urls = []
+    for url in urls:
+        if url.lower().startswith(('http://', 'https://')):
+            valid_urls.append(url)
+        else:
+            print(f"❌ Skipping invalid URL: {url}")
+    # Every copy of a URL would write to the same partial file, so each URL is fetched once
+    urls = list(dict.fromkeys(valid_urls))
+    if len(urls) < len(valid_urls):
+        print(f"⚠️ Skipping {len(valid_urls) - len(urls)} duplicate URLs")
+
+    host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+    # Create every host's semaphore up front; defaultdict is not safe to fill from many threads
+    for url in urls:
+        host_limits[urlparse(url).netloc]
+
+    print(f"--- 🌍 Downloading {len(urls)} images with {max_workers} workers ({per_host} per host) ---")
+    manifest = Manifest(download_dir)
+    results = []
+    start = time.perf_counter()
+    try:
+        with create_session(pool_size=max_workers, retries=retries, backoff=backoff) as session:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(fetch_one, session, url, download_dir, host_limits, manifest)
+                    for url in urls
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if not result['ok']:
+                        print(f"❌ {result['url']}: {result['error']}")
+                    results.append(result)
+    finally:
+        # Save whatever was fetched, even if the batch was interrupted
+        manifest.save()
+    return summarize_results(results, time.perf_counter() - start)
+
+
 # --- Main Execution Block ---
 # Principle: Practicality - Making the script directly runnable.
+#   python image_downloader.py                      -> asks for a single URL
+#   python image_downloader.py --batch urls.txt     -> downloads every URL in the file
 if __name__ == "__main__":
-    download_image()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Python Image Downloader")
+    parser.add_argument('--batch', metavar='URL_FILE', help="File with one image URL per line")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--per-host', type=int, default=4)
+    parser.add_argument('--retries', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.batch:
+        summary = download_batch(args.batch, max_workers=args.workers, per_host=args.per_host, retries=args.retries)
+        sys.exit(0 if summary and summary['failed'] == 0 else 1)
+    else:
+        download_image()